@@ -0,0 +1,207 @@
+# Benchmark suite for the practical examples
+# Times the hot paths of every practical example at growing dataset sizes and
+# saves the results as JSON, so a later run can be compared against them.
+#
+#   python Benchmarks/benchmark-suite.py                       # Every benchmark, every size
+#   python Benchmarks/benchmark-suite.py --sizes 1000,10000    # Only these sizes
+#   python Benchmarks/benchmark-suite.py --only search_cars    # Only benchmarks with this in their name
+#   python Benchmarks/benchmark-suite.py --output before.json
+#   python Benchmarks/benchmark-suite.py --compare before.json # Show the change since before.json
+
+import importlib.util
+import json
+import os
+import platform
+import sys
+import tempfile
+import timeit
+from contextlib import redirect_stdout
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+REPEAT = 3       # Each benchmark is timed this many times and the best time is kept
+SLOWER = 1.20    # --compare flags benchmarks that got more than 20% slower
+SCRATCH = tempfile.TemporaryDirectory()  # For files the benchmarks write; removed on exit
+
+# The examples import the shared instrumentation module from their own folder
+sys.path.append(os.path.join(ROOT, "PracticalExamples"))
+
+
+def load_script(relative_path, module_name):
+    """
+    Import one of the example scripts by its path.
+    The scripts have hyphens in their names (and email.py would hide the standard
+    library's email module), so they cannot be imported with a normal import statement.
+    """
+    spec = importlib.util.spec_from_file_location(module_name, os.path.join(ROOT, relative_path))
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+# --- Benchmarks --- #
+# Each benchmark takes the dataset size, builds its data and returns the function to time.
+# Anything the examples print is sent to os.devnull (see run_benchmark).
+
+def bench_search_cars(size):
+    cars = load_script("PracticalExamples/car-management-system.py", "car_management_system")
+    manager = cars.CarManager()
+    manager.load_cars([{"make": f"Make {i % 50}", "model": f"Model {i % 500}", "year": 1990 + i % 30}
+                       for i in range(size)])
+    return lambda: manager.search_cars(make="make 7")
+
+
+def make_rental_service(size):
+    rental = load_script("PracticalExamples/vehicle-rental-service.py", "vehicle_rental_service")
+    service = rental.VehicleRentalService()
+    service.vehicles = [rental.Car(f"Make {i % 50}", f"Model {i % 500}", 40 + i % 60, i % 2 == 0)
+                        if i % 3 else
+                        rental.Bike(f"Make {i % 50}", f"Model {i % 500}", 20 + i % 30, i % 5 == 0)
+                        for i in range(size)]
+    return service
+
+
+def bench_calculate_rental_cost(size):
+    service = make_rental_service(size)
+    indexes = range(size)
+
+    def run():
+        for index in indexes:
+            service.calculate_rental_cost(index, 3)
+    return run
+
+
+def bench_export_import_vehicles(size):
+    service = make_rental_service(size)
+    path = os.path.join(SCRATCH.name, "vehicles.json")
+
+    def run():
+        service.export_vehicles(path)
+        service.import_vehicles(path)
+    return run
+
+
+def bench_email_statistics(size):
+    email = load_script("email.py", "email_app")
+    email.inbox[:] = [email.Email(f"sender{i}@example.com", f"Subject {i}", "Content")
+                      for i in range(size)]
+    for message in email.inbox[::2]:
+        message.mark_as_read()
+    return email.email_statistics
+
+
+def bench_borrow_a_book(size):
+    library = load_script("PracticalExamples/library-management-system.py", "library_management_system")
+    library.library = library.Library()
+    library.library.add_books(library.Book(f"Title {i:07d}", f"Author {i % 1000}", 3)
+                              for i in range(size))
+    titles = [f"title {i:07d}" for i in range(size)]  # Every title, so the work grows with size
+
+    def run():
+        for title in titles:
+            library.borrow_a_book(title)
+            library.return_a_book(title)
+    return run
+
+
+def bench_calculate_total_sales(size):
+    onboarding = load_script("PracticalExamples/employee-onboarding-system.py", "employee_onboarding_system")
+    weekly_sales = [[(week * 7 + day) % 500 for day in range(7)] for week in range(size // 7)]
+    return lambda: onboarding.calculate_total_sales(weekly_sales)
+
+
+def bench_turn_on(size):
+    smart = load_script("PracticalExamples/smart-device-management.py", "smart_device_management")
+    devices = [smart.SmartDevice(f"Lamp {i}", "Light", f"Room {i % 20}", wattage=60)
+               for i in range(size)]
+
+    def run():
+        for device in devices:
+            device.turn_on()
+        for device in devices:
+            device.turn_off()
+    return run
+
+
+BENCHMARKS = {
+    "search_cars": bench_search_cars,
+    "calculate_rental_cost": bench_calculate_rental_cost,
+    "export_import_vehicles": bench_export_import_vehicles,
+    "email_statistics": bench_email_statistics,
+    "borrow_a_book": bench_borrow_a_book,
+    "calculate_total_sales": bench_calculate_total_sales,
+    "turn_on": bench_turn_on,
+}
+
+
+# --- Running and Reporting --- #
+def run_benchmark(name, size):
+    """Time one benchmark at one size; returns its result as a dictionary."""
+    with open(os.devnull, "w") as devnull, redirect_stdout(devnull):
+        function = BENCHMARKS[name](size)
+        timer = timeit.Timer(function)
+        number, _ = timer.autorange()  # Enough calls to take at least 0.2 seconds
+        times = [elapsed / number for elapsed in timer.repeat(repeat=REPEAT, number=number)]
+    return {"name": name, "size": size, "number": number,
+            "best": min(times), "mean": sum(times) / len(times)}
+
+
+def compare(results, baseline_path):
+    """Print how each result changed against a saved results file."""
+    with open(baseline_path) as file:
+        baseline = {(result["name"], result["size"]): result["best"]
+                    for result in json.load(file)["results"]}
+    print(f"\nCompared with {baseline_path}:")
+    slower = 0
+    for result in results:
+        before = baseline.get((result["name"], result["size"]))
+        if before is None:
+            continue
+        ratio = result["best"] / before
+        flag = "  <-- slower" if ratio > SLOWER else ""
+        slower += ratio > SLOWER
+        print(f"{result['name']:<25}{result['size']:>10,}{ratio:>10.2f}x{flag}")
+    return slower
+
+
+def main(argv):
+    sizes = DEFAULT_SIZES
+    only = None
+    output = "benchmark-results.json"
+    baseline = None
+    args = iter(argv)
+    for arg in args:
+        if arg == "--sizes":
+            sizes = [int(float(size)) for size in next(args).split(",")]
+        elif arg == "--only":
+            only = next(args)
+        elif arg == "--output":
+            output = next(args)
+        elif arg == "--compare":
+            baseline = next(args)
+        else:
+            raise SystemExit(f"Unknown argument: {arg}")
+
+    results = []
+    print(f"{'Benchmark':<25}{'Size':>10}{'Best (ms)':>12}{'Mean (ms)':>12}")
+    print("-" * 59)
+    for name in BENCHMARKS:
+        if only and only not in name:
+            continue
+        for size in sizes:
+            result = run_benchmark(name, size)
+            results.append(result)
+            print(f"{name:<25}{size:>10,}{result['best'] * 1000:>12.3f}{result['mean'] * 1000:>12.3f}")
+
+    with open(output, "w") as file:
+        json.dump({"python": platform.python_version(), "platform": platform.platform(),
+                   "results": results}, file, indent=4)
+    print(f"\nResults saved to {output}.")
+
+    if baseline and compare(results, baseline):
+        sys.exit(1)  # Lets a script or CI job notice the regression
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -491,15 +491,70 @@ class Pet:
 # - Validate VIN numbers.
 # - Display car details.
 
+# ----- Thread-Safe Class Counters -----
+# `Car.total_cars += 1` reads, adds and writes back in separate steps, so two
+# threads creating cars at the same moment can lose a count.
+# A sharded counter gives every thread its own shard (a one-item list only that
+# thread writes to) and adds the shards up when the value is read.
+
+# ShardedCounter lives in PracticalExamples/counters.py, shared with the smart
+# device example. The counter itself is kept in a private class attribute and
+# CounterValue reads it as a plain int, so Car.total_cars + 1 still works.
+
+import os
+import sys
+import threading
+
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                             "PracticalExamples"))
+from counters import CounterValue, ShardedCounter  # noqa: E402
+
+# ----- Bulk VIN Validation -----
+# A VIN is 17 characters; I, O and Q are never used (they look like 1 and 0).
+# The 9th character is a check digit: each character is turned into a number
+# (transliterated), multiplied by a weight for its position, and the total
+# modulo 11 must equal the check digit (10 is written as X).
+# The transliteration is a 256-byte table used with bytes.translate, so a whole
+# packed buffer of VINs is converted in one call.
+
+from operator import mul
+
+INVALID_VIN_CHARACTER = 255
+VIN_WEIGHTS = bytes([8, 7, 6, 5, 4, 3, 2, 10, 0, 9, 8, 7, 6, 5, 4, 3, 2])
+VIN_CHECK_CHARACTERS = b"0123456789X"
+VIN_VALUES = bytearray([INVALID_VIN_CHARACTER]) * 256
+for letters, value in (("0", 0), ("1AJ", 1), ("2BKS", 2), ("3CLT", 3), ("4DMU", 4),
+                       ("5ENV", 5), ("6FW", 6), ("7GPX", 7), ("8HY", 8), ("9RZ", 9)):
+    for letter in letters:
+        VIN_VALUES[ord(letter)] = value
+VIN_VALUES = bytes(VIN_VALUES)
+
+# ----- Interned (Dictionary-Encoded) Strings -----
+# A fleet of a million cars has only a few hundred colours and models, but
+# every car would otherwise hold its own copy of each string. A shared table
+# stores each distinct string once and cars keep a small integer code instead.
+# (manufacturer is already shared, because it is a class attribute.)
+
+# StringTable and EncodedField (a descriptor that stores the attribute as its
+# code) live in PracticalExamples/string_table.py, shared with the practical examples.
+
+from string_table import EncodedField, StringTable  # noqa: E402
+
+car_strings = StringTable()
+
 class Car:
     manufacturer = "Default Manufacturer"
-    total_cars = 0
+    _total_cars = ShardedCounter()  # Safe to increment from many threads
+    total_cars = CounterValue("_total_cars")  # An int, read from the counter
+    __slots__ = ("vin", "_color_code", "_model_code")  # No per-car __dict__
+    color = EncodedField(car_strings)
+    model = EncodedField(car_strings)
 
     def __init__(self, vin, color, model):
         self.vin = vin
         self.color = color
         self.model = model
-        Car.total_cars += 1
+        Car._total_cars += 1
 
     @classmethod
     def update_manufacturer(cls, new_manufacturer):
@@ -509,6 +564,24 @@ class Car:
     def validate_vin(vin):
         return len(vin) == 17 and vin.isalnum()
 
+    @staticmethod
+    def validate_vins(vins):
+        # Bulk check: length, forbidden letters and the ISO 3779 check digit.
+        # Returns a bytearray mask with 1 for each valid VIN and 0 otherwise.
+        mask = bytearray(len(vins))
+        positions = [i for i, vin in enumerate(vins) if len(vin) == 17 and vin.isascii()]
+        packed = "".join(vins[i] for i in positions).encode("ascii")  # 17 bytes per VIN
+        values = packed.translate(VIN_VALUES)  # Every character to its number at once
+        for n, i in enumerate(positions):
+            start = n * 17
+            chunk = values[start:start + 17]
+            if INVALID_VIN_CHARACTER in chunk:
+                continue
+            remainder = sum(map(mul, chunk, VIN_WEIGHTS)) % 11
+            if packed[start + 8] == VIN_CHECK_CHARACTERS[remainder]:
+                mask[i] = 1
+        return mask
+
     def display_details(self):
         return (f"VIN: {self.vin}, Color: {self.color}, Model: {self.model}, "
                 f"Manufacturer: {Car.manufacturer}")
@@ -525,6 +598,46 @@ print(car1.display_details())
 
 print(Car.validate_vin("1HGCM82633A123456"))  # Output: True
 
+# Filtering by colour compares integer codes instead of strings
+red = car_strings.encode("Red")
+print(sum(1 for car in (car1, car2) if car._color_code == red))  # Output: 1
+
+# Creating cars from 16 threads at once still counts every car
+def create_cars():
+    for _ in range(1000):
+        Car("1HGCM82633A123456", "Red", "Civic")
+
+threads = [threading.Thread(target=create_cars) for _ in range(16)]
+for thread in threads:
+    thread.start()
+for thread in threads:
+    thread.join()
+print(Car.total_cars)  # Output: 16002
+
+# Validating many VINs at once returns a mask: 1 = valid, 0 = invalid
+print(list(Car.validate_vins([
+    "1HGCM82633A004352",  # Valid
+    "1HGCM82633A004353",  # Wrong check digit
+    "1HGCM82633O004352",  # Contains the letter O
+    "1HGCM826",           # Too short
+])))  # Output: [1, 0, 0, 0]
+
+# Throughput benchmark
+import random
+import time
+
+def benchmark_validate_vins(count=1_000_000):
+    alphabet = "0123456789ABCDEFGHJKLMNPRSTUVWXYZ"
+    vins = ["".join(random.choices(alphabet, k=17)) for _ in range(count)]
+    start = time.perf_counter()
+    mask = Car.validate_vins(vins)
+    elapsed = time.perf_counter() - start
+    print(f"Validated {count:,} VINs in {elapsed:.2f}s "
+          f"({count / elapsed:,.0f} VINs/s, {sum(mask):,} valid)")
+
+if __name__ == "__main__":  # Importing this file should not run the benchmark
+    benchmark_validate_vins(100_000)
+
 # ----- Resources & Further Reading -----
 # - Think Python, 2nd edition: https://greenteapress.com/wp/think-python-2e/
 # - Official Python Documentation: https://docs.python.org/3/tutorial/classes.html#class-and-instance-variables
@@ -201,6 +201,77 @@ rect = Rectangle(5, 3)
 area = rect.calculate_area()
 perimeter = rect.calculate_perimeter()
 
+# -----------------------------------------------------------------------------
+# Working with Many Objects at Once: RectangleArray
+# -----------------------------------------------------------------------------
+
+"""
+Millions of separate Rectangle objects each carry their own attribute dictionary,
+and computing their areas means one method call per object.
+A RectangleArray stores all the lengths in one contiguous array and all the widths
+in another (a "structure of arrays"), so:
+- Memory: each rectangle costs two 8-byte floats instead of a whole object.
+- Speed: areas, perimeters and totals are computed in single passes with map()
+  over built-in operators, with no Python method call per rectangle.
+"""
+
+from array import array
+from itertools import repeat
+import operator  # operator.add, not add: a later example in this file defines its own add()
+
+class RectangleArray:
+    def __init__(self, lengths=(), widths=()):
+        self.lengths = array("d", lengths)
+        self.widths = array("d", widths)
+        if len(self.lengths) != len(self.widths):
+            raise ValueError("lengths and widths must be the same size.")
+
+    @classmethod
+    def from_rectangles(cls, rectangles):
+        rectangles = list(rectangles)
+        return cls((rect.length for rect in rectangles), (rect.width for rect in rectangles))
+
+    def to_rectangles(self):
+        return [Rectangle(length, width) for length, width in zip(self.lengths, self.widths)]
+
+    def __len__(self):
+        return len(self.lengths)
+
+    def append(self, length, width):
+        self.lengths.append(length)
+        self.widths.append(width)
+
+    def calculate_areas(self):
+        return array("d", map(operator.mul, self.lengths, self.widths))
+
+    def calculate_perimeters(self):
+        return array("d", map(operator.mul, repeat(2.0), map(operator.add, self.lengths, self.widths)))
+
+    def total_area(self):
+        return sum(map(operator.mul, self.lengths, self.widths))
+
+    def total_perimeter(self):
+        return 2 * (sum(self.lengths) + sum(self.widths))
+
+    def bounding_stats(self):
+        """Smallest and largest length, width and area, plus the mean area."""
+        if not self.lengths:
+            return {}
+        areas = self.calculate_areas()
+        return {
+            "min_length": min(self.lengths), "max_length": max(self.lengths),
+            "min_width": min(self.widths), "max_width": max(self.widths),
+            "min_area": min(areas), "max_area": max(areas),
+            "mean_area": sum(areas) / len(areas),
+        }
+
+# Usage:
+rects = RectangleArray.from_rectangles([Rectangle(5, 3), Rectangle(2, 4), Rectangle(10, 1)])
+print(rects.calculate_areas().tolist())  # Output: [15.0, 8.0, 10.0]
+print(rects.total_perimeter())  # Output: 50.0
+print(rects.bounding_stats()["max_area"])  # Output: 15.0
+print(rects.to_rectangles()[0].calculate_area())  # Output: 15.0
+
 # -----------------------------------------------------------------------------
 # Lesson Conclusion & Summary
 # -----------------------------------------------------------------------------
@@ -279,6 +350,83 @@ def add(x, y):
 res = reduce(add, a)  # Sum all elements in the list
 print(res)  # Output: 15
 
+# Parallel reduce
+"""
+reduce() combines the items one at a time, so it can only use one CPU core.
+If the function is associative - (a + b) + c == a + (b + c) - the sequence can
+be split into chunks, each chunk reduced separately (in parallel), and the
+partial results reduced again at the end.
+- Processes run Python code on several cores at once; threads only help when
+  the function releases the GIL (e.g. NumPy or I/O).
+- Built-in operators on numbers skip reduce() and the pool entirely: sum() for
+  addition and math.prod() for multiplication run in C and are much faster.
+- Sending chunks to other processes costs time too, so processes only pay off
+  when the function does real work per item and there are several CPU cores.
+- Only a few chunks per worker are handed to the pool at a time, so a long
+  iterator is never read into memory all at once.
+"""
+
+import math
+import operator
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import islice
+
+FAST_REDUCERS = {operator.add: sum, operator.mul: math.prod, max: max, min: min}
+
+def reduce_chunk(function, chunk):
+    fast = FAST_REDUCERS.get(function)
+    if fast is not None and isinstance(chunk[0], (int, float)):
+        return fast(chunk)
+    return reduce(function, chunk)
+
+def parallel_reduce(function, iterable, chunk_size=100_000, use_processes=True, max_workers=None):
+    """Reduce a large sequence or iterator in chunks across a pool of workers.
+    The function must be associative; with processes it must also be picklable
+    (defined at the top level of a module)."""
+    iterator = iter(iterable)
+    chunks = iter(lambda: list(islice(iterator, chunk_size)), [])
+    first = next(chunks, None)
+    if first is None:
+        raise TypeError("parallel_reduce() of empty iterable")
+    second = next(chunks, None)
+    if second is None:  # Only one chunk: no need for a pool
+        return reduce_chunk(function, first)
+    if function in FAST_REDUCERS and isinstance(first[0], (int, float)):
+        # C-level reducers are faster than sending the chunks to other workers
+        partials = [reduce_chunk(function, first), reduce_chunk(function, second)]
+        partials.extend(reduce_chunk(function, chunk) for chunk in chunks)
+        return reduce_chunk(function, partials)
+    pool_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    max_workers = max_workers or os.cpu_count() or 1
+    all_chunks = (chunk for group in ((first, second), chunks) for chunk in group)
+    partials = []
+    pending = deque()  # Futures in submission order, at most two per worker
+    with pool_class(max_workers=max_workers) as pool:
+        for chunk in all_chunks:
+            if len(pending) >= 2 * max_workers:
+                partials.append(pending.popleft().result())
+            pending.append(pool.submit(reduce_chunk, function, chunk))
+        partials.extend(future.result() for future in pending)
+    return reduce_chunk(function, partials)
+
+def benchmark_reduce(count=5_000_000):
+    numbers = list(range(count))
+    for label, run in (
+        ("reduce(add)", lambda: reduce(add, numbers)),
+        ("parallel_reduce(add), processes", lambda: parallel_reduce(add, numbers, chunk_size=500_000)),
+        ("parallel_reduce(operator.add), fast path", lambda: parallel_reduce(operator.add, numbers, chunk_size=500_000)),
+    ):
+        start = time.perf_counter()
+        result = run()
+        print(f"{label}: {result} in {time.perf_counter() - start:.3f}s")
+
+if __name__ == "__main__":  # Worker processes may re-import this file, so guard the pool
+    print(parallel_reduce(add, range(1, 200_001), chunk_size=50_000))  # Output: 20000100000
+    benchmark_reduce()
+
 # -----------------------------------------------------------------------------
 # Decorators (for Later)
 # -----------------------------------------------------------------------------
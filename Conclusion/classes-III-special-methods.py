@@ -43,18 +43,146 @@ operations, such as closing files or releasing resources.
 """
 
 class FileManager:
-    def __init__(self, filename):
-        self.file = open(filename, 'w')
+    def __init__(self, filename, buffer_size=64 * 1024):
+        self.filename = filename
+        self.buffer_size = buffer_size  # 0 writes every call straight to the file
+        self.pending = []
+        self.pending_size = 0
+        self.closed = True  # Stays True if opening fails, so __del__ has nothing to do
+        self.open_file()
+        self.closed = False
         print(f"Opened {filename}")
 
-    def __del__(self):
+    def open_file(self):
+        # Unbuffered: FileManager does its own buffering in write()
+        self.file = open(self.filename, 'wb', buffering=0)
+
+    def write_out(self, data):
+        # A raw (unbuffered) file may write only part of the data, so keep
+        # writing the rest until all of it is out
+        view = memoryview(data)
+        while view:
+            written = self.file.write(view)
+            view = view[written:]
+
+    def close_file(self):
         self.file.close()
-        print("File closed.")
+
+    def write(self, text):
+        if self.closed:
+            raise ValueError("I/O operation on closed file.")
+        self.pending.append(text)
+        self.pending_size += len(text)
+        if self.pending_size >= self.buffer_size:
+            self.flush()
+
+    def flush(self):
+        # One large write instead of one per write() call
+        if self.pending:
+            self.write_out("".join(self.pending).encode())
+            self.pending.clear()
+            self.pending_size = 0
+
+    def close(self):
+        # Safe to call more than once; only the first call does anything
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.flush()
+        finally:
+            self.close_file()
+            print("File closed.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        return False  # Let any exception carry on
+
+    def __del__(self):
+        # Only a safety net: close() has normally been called already
+        self.close()
 
 file_manager = FileManager("example.txt")
-file_manager.file.write("Hello, World!")
+file_manager.write("Hello, World!")
+del file_manager
 # When the object is destroyed, __del__ is called, closing the file.
 
+# __enter__ and __exit__ (Context Managers)
+"""
+__del__ runs whenever the object happens to be destroyed, which may be much later (or, for
+objects caught in reference cycles, only when the garbage collector runs). A with-block calls
+__enter__ on the way in and __exit__ on the way out, even if an exception is raised, so the
+file is flushed and closed at a known point.
+"""
+
+with FileManager("example.txt") as file_manager:
+    file_manager.write("Hello, ")
+    file_manager.write("World!")
+# The file is closed here.
+
+# A memory-mapped writer
+"""
+MmapFileManager keeps the same interface but copies each flushed batch into a memory-mapped
+region of the file. The file is grown in large steps, and cut back to the real length on close.
+"""
+
+import mmap
+
+class MmapFileManager(FileManager):
+    def open_file(self):
+        self.file = open(self.filename, 'w+b')
+        self.map = None
+        self.capacity = 0
+        self.position = 0
+
+    def grow(self, needed):
+        capacity = max(needed, self.capacity * 2, mmap.ALLOCATIONGRANULARITY)
+        if self.map is not None:
+            self.map.close()
+        self.file.truncate(capacity)
+        self.map = mmap.mmap(self.file.fileno(), capacity)
+        self.capacity = capacity
+
+    def write_out(self, data):
+        end = self.position + len(data)
+        if end > self.capacity:
+            self.grow(end)
+        self.map[self.position:end] = data
+        self.position = end
+
+    def close_file(self):
+        if self.map is not None:
+            self.map.flush()
+            self.map.close()
+        self.file.truncate(self.position)
+        self.file.close()
+
+# Benchmark: writing many short lines with and without buffering
+import os
+import tempfile
+import time
+
+def benchmark_file_managers(lines=200_000):
+    line = "2024-01-01 12:00:00 INFO request handled\n"
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "log.txt")
+        for label, make_manager in (
+                ("unbuffered", lambda: FileManager(path, buffer_size=0)),
+                ("buffered (64 KiB)", lambda: FileManager(path)),
+                ("mmap (64 KiB)", lambda: MmapFileManager(path))):
+            start = time.perf_counter()
+            with make_manager() as manager:
+                for _ in range(lines):
+                    manager.write(line)
+            elapsed = time.perf_counter() - start
+            print(f"{label}: {elapsed * 1000:.1f} ms, {os.path.getsize(path):,} bytes")
+
+if __name__ == "__main__":  # Importing this file should not run the benchmark
+    benchmark_file_managers()
+
 # -----------------------------------------------------------------------------
 # String Representation of Objects
 # -----------------------------------------------------------------------------
@@ -118,20 +246,93 @@ containers.
 """
 
 # Example: Implementing Container-Like Behavior
+import bisect
+
+class ContactListView:
+    """
+    A read-only window onto part of a ContactList. Slicing a ContactList returns
+    one of these instead of copying the contacts, like a memoryview does for bytes.
+    """
+    def __init__(self, contact_list, indices):
+        self.contact_list = contact_list
+        self.indices = indices  # A range of positions in the ContactList
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return ContactListView(self.contact_list, self.indices[key])
+        return self.contact_list.contact_list[self.indices[key]]
+
+    def __iter__(self):
+        contacts = self.contact_list.contact_list
+        for position in self.indices:
+            yield contacts[position]
+
+    def __repr__(self):
+        return f"ContactListView({list(self)!r})"
+
 class ContactList:
     def __init__(self):
         self.contact_list = []
+        self.counts = {}  # Hash index: contact -> number of times it is stored
+        self.sorted_names = []  # (case-folded name, position), sorted for prefix lookup
+        self.names_sorted = True  # False once contacts are added after the last sort
 
     def add_contact(self, contact):
+        # Appending and sorting later is cheaper than inserting each name in place
+        # (bisect.insort is O(n), so adding n contacts one by one would be O(n²))
+        self.sorted_names.append((contact.casefold(), len(self.contact_list)))
+        self.names_sorted = False
         self.contact_list.append(contact)
+        self.counts[contact] = self.counts.get(contact, 0) + 1
+
+    def extend(self, contacts):
+        for contact in contacts:
+            self.add_contact(contact)
 
     def __getitem__(self, key):
+        if isinstance(key, slice):
+            return ContactListView(self, range(len(self.contact_list))[key])
         return self.contact_list[key]
+
+    def __len__(self):
+        return len(self.contact_list)
+
+    def __contains__(self, contact):
+        return contact in self.counts  # A hash lookup instead of scanning the list
+
+    def __iter__(self):
+        return iter(self.contact_list)
+
+    def find_by_prefix(self, prefix):
+        """Return every contact whose name starts with prefix, ignoring case, in name order."""
+        if not self.names_sorted:
+            self.sorted_names.sort()  # Timsort only has to merge in the new names
+            self.names_sorted = True
+        prefix = prefix.casefold()
+        results = []
+        position = bisect.bisect_left(self.sorted_names, (prefix,))
+        while position < len(self.sorted_names):
+            name, index = self.sorted_names[position]
+            if not name.startswith(prefix):
+                break
+            results.append(self.contact_list[index])
+            position += 1
+        return results
     
 contact_list = ContactList()
 contact_list.add_contact("Test Contact")
 print(contact_list[0])  # Output: Test Contact
 
+for name in ("Bruce Wayne", "Barry Allen", "Diana Prince", "Clark Kent"):
+    contact_list.add_contact(name)
+print(len(contact_list))  # Output: 5
+print("Diana Prince" in contact_list)  # Output: True
+print(contact_list[1:3])  # Output: ContactListView(['Bruce Wayne', 'Barry Allen'])
+print(contact_list.find_by_prefix("b"))  # Output: ['Barry Allen', 'Bruce Wayne']
+
 # Common Container Methods:
 """
 - len(object) → __len__(self)
@@ -150,6 +351,8 @@ two objects using >, the __gt__ method is called.
 """
 
 # Example: Comparing Students by Average
+from operator import attrgetter
+
 class Student:
     def __init__(self, fullname, student_number, average):
         self.fullname = fullname
@@ -159,9 +362,67 @@ class Student:
     def __gt__(self, other):
         return self.average > other.average
 
+    # The other orderings compare averages too. __eq__ is left alone, so two
+    # students with the same average are still different (and hashable) objects
+    def __lt__(self, other):
+        return self.average < other.average
+
+    def __le__(self, other):
+        return self.average <= other.average
+
+    def __ge__(self, other):
+        return self.average >= other.average
+
+    def __repr__(self):
+        return f"Student({self.fullname!r}, {self.average})"
+
 student1 = Student("Peter Parker", "PP123", 88)
 student2 = Student("Tony Stark", "TS456", 97)
 print(student1 > student2)  # Output: False
+print(student1 <= student2)  # Output: True
+
+# Example: Ranking Students with bisect
+"""
+Because Students can be compared, they can be kept in a list sorted by
+average with bisect.insort (key=by_average skips the method calls), which finds each insert position with a binary search
+(O(log n) comparisons). Top-k, percentile and range queries then only need
+slicing and binary searches, never a full sort.
+"""
+
+by_average = attrgetter("average")
+
+class StudentRanking:
+    def __init__(self, students=()):
+        self.students = sorted(students, key=by_average)  # Lowest average first
+
+    def add(self, student):
+        bisect.insort(self.students, student, key=by_average)
+
+    def __len__(self):
+        return len(self.students)
+
+    def top(self, k):
+        """The k students with the highest averages, best first."""
+        return self.students[-k:][::-1] if k > 0 else []
+
+    def percentile_rank(self, average):
+        """Percentage of students with a lower average."""
+        if not self.students:
+            return 0.0
+        return 100 * bisect.bisect_left(self.students, average, key=by_average) / len(self.students)
+
+    def between(self, low, high):
+        """Students whose average is between low and high (inclusive), lowest first."""
+        start = bisect.bisect_left(self.students, low, key=by_average)
+        end = bisect.bisect_right(self.students, high, key=by_average)
+        return self.students[start:end]
+
+ranking = StudentRanking([student1, student2])
+ranking.add(Student("Bruce Banner", "BB789", 92))
+ranking.add(Student("Natasha Romanoff", "NR321", 75))
+print(ranking.top(2))  # Output: [Student('Tony Stark', 97), Student('Bruce Banner', 92)]
+print(ranking.percentile_rank(92))  # Output: 50.0
+print(ranking.between(80, 95))  # Output: [Student('Peter Parker', 88), Student('Bruce Banner', 92)]
 
 # Common Comparator Methods:
 """
@@ -212,16 +473,153 @@ your objects.
 """
 
 class MyNumber:
+    __slots__ = ("value",)  # No per-object __dict__: smaller and faster to create
+
     def __init__(self, value):
         self.value = value
 
     def __add__(self, other):
         return MyNumber(self.value + other.value)
 
+    def __sub__(self, other):
+        return MyNumber(self.value - other.value)
+
+    def __mul__(self, other):
+        return MyNumber(self.value * other.value)
+
+    # In-place operators (+=, -=, *=) update this object instead of creating a new one
+    def __iadd__(self, other):
+        self.value += other.value
+        return self
+
+    def __isub__(self, other):
+        self.value -= other.value
+        return self
+
+    def __imul__(self, other):
+        self.value *= other.value
+        return self
+
+    @staticmethod
+    def sum(numbers):
+        """Add up many MyNumbers, creating only the one result object."""
+        return MyNumber(sum(map(attrgetter("value"), numbers)))
+
 num1 = MyNumber(10)
 num2 = MyNumber(5)
 num3 = num1 + num2
 print(num3.value)  # Output: 15
+num3 += num2  # Same object, new value
+print(num3.value)  # Output: 20
+
+# Many numbers at once: MyNumberArray
+"""
+A MyNumberArray keeps plain values in one array.array instead of one object per
+number, and its operators work on whole arrays in a single pass.
+"""
+
+from array import array
+from operator import add, mul, sub
+
+class MyNumberArray:
+    def __init__(self, values=(), typecode="d"):
+        self.values = array(typecode, values)
+
+    @classmethod
+    def from_numbers(cls, numbers):
+        return cls(map(attrgetter("value"), numbers))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):  # A slice is a smaller MyNumberArray, like a list slice
+            return MyNumberArray(self.values[index], self.values.typecode)
+        return MyNumber(self.values[index])
+
+    def combine(self, other, operation):
+        # map() stops at the shorter array, so mismatched lengths must be caught here
+        if len(self.values) != len(other.values):
+            raise ValueError(f"Cannot combine arrays of length {len(self.values)} and {len(other.values)}.")
+        return array(self.values.typecode, map(operation, self.values, other.values))
+
+    def __add__(self, other):
+        return MyNumberArray(self.combine(other, add), self.values.typecode)
+
+    def __sub__(self, other):
+        return MyNumberArray(self.combine(other, sub), self.values.typecode)
+
+    def __mul__(self, other):
+        return MyNumberArray(self.combine(other, mul), self.values.typecode)
+
+    # In-place operators keep the same MyNumberArray and array, like MyNumber's
+    def __iadd__(self, other):
+        self.values[:] = self.combine(other, add)
+        return self
+
+    def __isub__(self, other):
+        self.values[:] = self.combine(other, sub)
+        return self
+
+    def __imul__(self, other):
+        self.values[:] = self.combine(other, mul)
+        return self
+
+    def sum(self):
+        return MyNumber(sum(self.values))
+
+prices = MyNumberArray([1.5, 2.5, 3.0])
+prices += MyNumberArray([0.5, 0.5, 0.5])
+print(prices.values.tolist())  # Output: [2.0, 3.0, 3.5]
+print(prices.sum().value)  # Output: 8.5
+print(prices[1:].values.tolist())  # Output: [3.0, 3.5]
+
+# Benchmark: time and MyNumber objects created when summing many numbers
+import time
+
+def count_created(run):
+    """Run a function and count the MyNumber objects it creates."""
+    created = 0
+    original_init = MyNumber.__init__
+
+    def counting_init(self, value):
+        nonlocal created
+        created += 1
+        original_init(self, value)
+
+    MyNumber.__init__ = counting_init
+    try:
+        run()
+    finally:
+        MyNumber.__init__ = original_init
+    return created
+
+def benchmark_mynumber_sum(count=200_000):
+    numbers = [MyNumber(i) for i in range(count)]
+    number_array = MyNumberArray.from_numbers(numbers)
+
+    def plus_loop():
+        total = MyNumber(0)
+        for number in numbers:
+            total = total + number  # A new temporary object every time
+        return total
+
+    def in_place_loop():
+        total = MyNumber(0)
+        for number in numbers:
+            total += number  # Reuses the same object
+        return total
+
+    for label, run in (("total = total + n", plus_loop), ("total += n", in_place_loop),
+                       ("MyNumber.sum", lambda: MyNumber.sum(numbers)),
+                       ("MyNumberArray.sum", number_array.sum)):
+        start = time.perf_counter()
+        run()
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {elapsed * 1000:.1f} ms, {count_created(run):,} objects created")
+
+if __name__ == "__main__":  # Importing this file should not run the benchmark
+    benchmark_mynumber_sum()
 
 # Duck Typing
 """
@@ -246,6 +644,68 @@ animals = [Dog(), Cat(), Car()]
 for animal in animals:
     animal.speak()
 
+# Calling one method on many mixed objects
+"""
+Each animal.speak() looks speak up on the object's class before calling it. When a list holds
+millions of objects of only a few types, group_by_type() sorts them into one list per type, and
+dispatch() looks each method up once per type (remembering it in method_cache) and calls it on
+the whole group with map(). The method is looked up on the class, so a method stored on a single
+instance is not used, and the results come back grouped by type rather than in list order.
+
+It is not much faster in CPython. Since 3.11 the interpreter caches the method lookup at each
+call site, so a plain loop already skips the work dispatch() saves. In benchmark_dispatch()
+dispatch() on pre-grouped objects is within a few percent of the loop (0.97x-1.05x), and
+grouping costs more than that, so a dispatch() over an ungrouped list is slower than the loop.
+Group objects by type because the code needs per-type handling, not for speed.
+"""
+
+from collections import defaultdict
+
+method_cache = {}
+
+def lookup_method(cls, method_name):
+    key = (cls, method_name)
+    method = method_cache.get(key)
+    if method is None:
+        method = method_cache[key] = getattr(cls, method_name)
+    return method
+
+def group_by_type(objects):
+    groups = defaultdict(list)
+    for obj in objects:
+        groups[type(obj)].append(obj)
+    return groups
+
+def dispatch(groups, method_name):
+    """Call method_name on every object in every group; returns {type: results}."""
+    return {cls: list(map(lookup_method(cls, method_name), group))
+            for cls, group in groups.items()}
+
+dispatch(group_by_type(animals), "speak")  # WOOF! MEOW! HONK!
+
+# Benchmark: one call per object against dispatch() over groups made once
+def benchmark_dispatch(count=1_000_000, rounds=5):
+    zoo = [Lion() if i % 3 else Animal() for i in range(count)]
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        [animal.make_sound() for animal in zoo]
+    loop = time.perf_counter() - start
+    print(f"animal.make_sound() per object: {loop * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    groups = group_by_type(zoo)
+    grouped = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(rounds):
+        dispatch(groups, "make_sound")
+    dispatched = time.perf_counter() - start
+    print(f"dispatch() on pre-grouped objects: {dispatched * 1000:.1f} ms "
+          f"({loop / dispatched:.2f}x), plus {grouped * 1000:.1f} ms to group them once")
+
+if __name__ == "__main__":  # Importing this file should not run the benchmark
+    benchmark_dispatch()
+
 # -----------------------------------------------------------------------------
 # Summary
 # -----------------------------------------------------------------------------
@@ -1,7 +1,26 @@
+import gc
 import json
+import sys
+import time
+
+from instrumentation import instrumented
+from object_pool import GCMonitor, ObjectPool
+from string_table import EncodedField, StringTable
+
+# A fleet has only a few hundred distinct makes and models, so all cars share one table
+car_strings = StringTable()
 
 class Car:
+    # __slots__ removes the per-car __dict__; make and model are stored as integer codes
+    __slots__ = ("_make_code", "_model_code", "year")
+    make = EncodedField(car_strings)
+    model = EncodedField(car_strings)
+
     def __init__(self, make, model, year):
+        self.reset(make, model, year)
+
+    def reset(self, make, model, year):
+        """Give the car new details; used by ObjectPool to reuse a released car."""
         self.make = make
         self.model = model
         self.year = year
@@ -14,9 +33,12 @@ class Car:
         return {"make": self.make, "model": self.model, "year": self.year}
 
 class CarManager:
-    def __init__(self):
+    def __init__(self, pool=None):
         self.cars = []
+        # Optional ObjectPool: imports then reuse the cars they replace
+        self.pool = pool
 
+    @instrumented("car_manager_add_car")
     def add_car(self, make, model, year):
         """Add a new car to the system."""
         if not make or not model or not year:
@@ -27,6 +49,7 @@ class CarManager:
         self.cars.append(car)
         print(f"Car added: {car}")
 
+    @instrumented("car_manager_update_car")
     def update_car(self, index, make=None, model=None, year=None):
         """Update an existing car's details."""
         if index < 0 or index >= len(self.cars):
@@ -42,16 +65,20 @@ class CarManager:
             car.year = year
         print(f"Car updated: {car}")
 
+    @instrumented("car_manager_search_cars")
     def search_cars(self, make=None, model=None, year=None):
         """Search for cars by make, model, or year."""
+        # Compare integer codes instead of lower-casing every car's strings
+        make_codes = car_strings.codes_matching(make) if make else ()
+        model_codes = car_strings.codes_matching(model) if model else ()
         results = []
         for car in self.cars:
-            if (make and car.make.lower() == make.lower()) or \
-               (model and car.model.lower() == model.lower()) or \
+            if car._make_code in make_codes or car._model_code in model_codes or \
                (year and car.year == year):
                 results.append(car)
         return results
 
+    @instrumented("car_manager_list_cars")
     def list_cars(self):
         """List all cars in the system."""
         if not self.cars:
@@ -59,6 +86,7 @@ class CarManager:
         for i, car in enumerate(self.cars):
             print(f"{i + 1}. {car}")
 
+    @instrumented("car_manager_export_cars")
     def export_cars(self, filename):
         """Export car data to a JSON file."""
         car_data = [car.to_dict() for car in self.cars]
@@ -66,13 +94,41 @@ class CarManager:
             json.dump(car_data, file, indent=4)
         print(f"Car data exported to {filename}.")
 
+    @instrumented("car_manager_import_cars")
     def import_cars(self, filename):
         """Import car data from a JSON file."""
         with open(filename, "r") as file:
             car_data = json.load(file)
-        self.cars = [Car(**data) for data in car_data]
+        self.load_cars(car_data)
         print(f"Car data imported from {filename}.")
 
+    @instrumented("car_manager_load_cars")
+    def load_cars(self, car_data):
+        """Replace all cars with cars built from a list of dictionaries."""
+        if self.pool is None:
+            self.cars = [Car(**data) for data in car_data]
+            return
+        # The replaced cars go back to the pool and are reset with the new details
+        self.pool.release_all(self.cars)
+        acquire = self.pool.acquire
+        self.cars = [acquire(**data) for data in car_data]
+
+def benchmark_car_pool(count=100_000, cycles=10):
+    """Reload the same cars repeatedly, with and without an ObjectPool."""
+    car_data = [{"make": f"Make {i % 50}", "model": f"Model {i % 500}", "year": 1990 + i % 30}
+                for i in range(count)]
+    for label, pool in (("new cars", None), ("pooled cars", ObjectPool(Car, Car.reset))):
+        manager = CarManager(pool)
+        gc.collect()
+        with GCMonitor() as monitor:
+            start = time.perf_counter()
+            for _ in range(cycles):
+                manager.load_cars(car_data)
+            elapsed = time.perf_counter() - start
+        allocated = pool.created if pool else count * cycles
+        print(f"{label}: {elapsed * 1000:.1f} ms, {allocated:,} cars allocated, "
+              f"{len(monitor.pauses)} GC runs pausing {monitor.total_pause() * 1000:.1f} ms")
+
 # Example Usage
 def main():
     manager = CarManager()
@@ -103,4 +159,7 @@ def main():
     manager.import_cars("cars.json")
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark" in sys.argv:
+        benchmark_car_pool()
+    else:
+        main()
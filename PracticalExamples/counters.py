@@ -0,0 +1,103 @@
+"""
+Thread-safe counters for the practical examples.
+
+`cls.count += 1` on a plain int reads the value, adds one and writes it back in
+separate steps, so two threads counting at the same moment can lose a count.
+ShardedCounter gives every thread its own shard and adds the shards up when the
+value is read. CounterValue exposes a counter kept in a private class attribute
+as a plain int, so the public attribute still behaves like a number:
+
+    class Car:
+        _total_cars = ShardedCounter()
+        total_cars = CounterValue("_total_cars")  # Car.total_cars is an int
+"""
+
+import threading
+import weakref
+
+
+class ShardToken:
+    """Kept only in a thread's threading.local, so it is dropped when the thread ends."""
+
+    __slots__ = ("__weakref__",)
+
+
+class ShardedCounter:
+    """
+    A counter that can be updated from many threads without losing counts.
+    Each thread adds to its own shard (a one-item list that only it writes to),
+    so updates never wait on a lock; reading the value sums the shards. When a
+    thread finishes, its shard is folded into base, so thread-per-task workloads
+    do not leave a growing list of shards behind.
+    """
+
+    def __init__(self, value=0):
+        self.base = value
+        self.local = threading.local()
+        self.shards = {}  # id of a live thread's ShardToken -> that thread's shard
+        self.lock = threading.RLock()  # Taken to create, fold or read shards, never to add
+
+    def add(self, amount=1):
+        """Add to this thread's shard."""
+        try:
+            shard = self.local.shard
+        except AttributeError:
+            shard = self.new_shard()
+        shard[0] += amount
+
+    def new_shard(self):
+        """Give the current thread a shard, to be folded into base when it ends."""
+        token = self.local.token = ShardToken()
+        shard = self.local.shard = [0]
+        with self.lock:
+            self.shards[id(token)] = shard
+        weakref.finalize(token, self.fold, id(token))
+        return shard
+
+    def fold(self, key):
+        with self.lock:
+            self.base += self.shards.pop(key)[0]
+
+    @property
+    def value(self):
+        """The merged value of all shards."""
+        with self.lock:
+            return self.base + sum(shard[0] for shard in list(self.shards.values()))
+
+    # `counter += n` adds to the shard and keeps the same counter object, so
+    # `cls.attribute += n` is safe on a class attribute holding a counter
+    def __iadd__(self, amount):
+        self.add(amount)
+        return self
+
+    def __isub__(self, amount):
+        self.add(-amount)
+        return self
+
+    def __int__(self):
+        return int(self.value)
+
+    def __index__(self):
+        return int(self.value)
+
+    def __float__(self):
+        return float(self.value)
+
+    def __format__(self, format_spec):
+        return format(self.value, format_spec)
+
+    def __str__(self):
+        return str(self.value)
+
+    def __repr__(self):
+        return f"ShardedCounter({self.value})"
+
+
+class CounterValue:
+    """Descriptor that reads a ShardedCounter class attribute as an int, from the class or an instance."""
+
+    def __init__(self, counter_name):
+        self.counter_name = counter_name
+
+    def __get__(self, instance, owner):
+        return int(getattr(owner, self.counter_name))
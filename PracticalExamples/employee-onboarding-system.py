@@ -36,6 +36,8 @@ o	Objective: Build a system to manage employee onboarding details,
 """
 
 # import modules
+import itertools # Used to number employees
+import math # Used in verify_sales_summary
 from tabulate import tabulate # Used in display_employee_data
 
 # Step 1: String Manipulation
@@ -57,7 +59,7 @@ def display_employee_data(full_name, age, department, hobbies, sales):
         ["Full Name:", full_name],
         ["Age:", age],
         ["Department:", department],
-        ["Hobbies:", ", ".join(hobbies)],
+        ["Hobbies:", ", ".join(hobbies.values())],
     ]
     
     # Print the employee data in table format
@@ -75,22 +77,113 @@ def display_employee_data(full_name, age, department, hobbies, sales):
     
 # Step 2: Lists (Employee Hobbies and Sales Data)
 
+# Hobbies are interned: every distinct hobby name is stored once in hobby_names
+# and referred to everywhere else by its integer ID.
+hobby_ids = {}    # hobby name -> hobby ID
+hobby_names = []  # hobby ID -> hobby name
+hobby_index = {}  # hobby ID -> {employee ID: employee}, in the order they were added
+
+
+def intern_hobby(hobby):
+    """Return the integer ID for a hobby, registering it if it is new."""
+    hobby_id = hobby_ids.get(hobby)
+    if hobby_id is None:
+        hobby_id = len(hobby_names)
+        hobby_ids[hobby] = hobby_id
+        hobby_names.append(hobby)
+    return hobby_id
+
+
+def create_hobby_set(hobbies):
+    """
+    Build an ordered hobby set from a list of hobby names.
+    The set is a dict of hobby ID -> hobby name, so membership, adding and
+    removing are O(1) while insertion order is kept for display.
+    """
+    hobby_set = {}
+    for hobby in hobbies:
+        add_hobby(hobby_set, hobby)
+    return hobby_set
+
+
 def add_hobby(hobbies, new_hobby):
-    """Add a new hobby to the hobbies list."""
-    hobbies.append(new_hobby)
+    """Add a new hobby to the hobby set."""
+    hobby_id = intern_hobby(new_hobby)
+    hobbies[hobby_id] = hobby_names[hobby_id]
     return hobbies
 
 
 def remove_hobby(hobbies, hobby):
-    """Remove a hobby from the hobbies list."""
-    if hobby in hobbies:
-        hobbies.remove(hobby)
+    """Remove a hobby from the hobby set."""
+    hobby_id = hobby_ids.get(hobby)
+    if hobby_id is not None:
+        hobbies.pop(hobby_id, None)
     return hobbies
 
 
+def has_hobby(hobbies, hobby):
+    """Check whether a hobby is in the hobby set."""
+    hobby_id = hobby_ids.get(hobby)
+    return hobby_id is not None and hobby_id in hobbies
+
+
 def display_hobbies(hobbies):
     """Display the list of hobbies."""
-    print("Employee Hobbies:", hobbies)
+    print("Employee Hobbies:", list(hobbies.values()))
+
+
+def index_employee_hobbies(employee):
+    """
+    Add every hobby of an employee to the hobby -> employees index.
+    Employees are indexed by their ID, so two employees with the same name
+    are kept apart and renaming an employee needs no re-indexing.
+    """
+    for hobby_id in employee['hobbies']:
+        hobby_index.setdefault(hobby_id, {})[employee['id']] = employee
+
+
+def unindex_employee_hobbies(employee):
+    """Remove every hobby of an employee from the hobby -> employees index."""
+    for hobby_id in employee['hobbies']:
+        hobby_index.get(hobby_id, {}).pop(employee['id'], None)
+
+
+def add_employee_hobby(employee, new_hobby):
+    """Add a hobby to an employee and keep the hobby index up to date."""
+    add_hobby(employee['hobbies'], new_hobby)
+    hobby_index.setdefault(hobby_ids[new_hobby], {})[employee['id']] = employee
+    return employee
+
+
+def remove_employee_hobby(employee, hobby):
+    """Remove a hobby from an employee and keep the hobby index up to date."""
+    remove_hobby(employee['hobbies'], hobby)
+    hobby_id = hobby_ids.get(hobby)
+    if hobby_id is not None:
+        hobby_index.get(hobby_id, {}).pop(employee['id'], None)
+    return employee
+
+
+def find_employees_by_hobby(hobby):
+    """Return the names of all employees who share a hobby."""
+    hobby_id = hobby_ids.get(hobby)
+    if hobby_id is None:
+        return []
+    return [employee['name'] for employee in hobby_index.get(hobby_id, {}).values()]
+
+
+def find_hobby_matches(employee):
+    """
+    Rank other employees by the number of hobbies they share with an employee.
+    Only the index entries for the employee's own hobbies are visited.
+    :return: list of (employee name, shared hobby count), best match first
+    """
+    shared = {}  # employee ID -> [employee name, shared hobby count]
+    for hobby_id in employee['hobbies']:
+        for employee_id, other in hobby_index.get(hobby_id, {}).items():
+            if employee_id != employee['id']:
+                shared.setdefault(employee_id, [other['name'], 0])[1] += 1
+    return sorted(map(tuple, shared.values()), key=lambda match: match[1], reverse=True)
 
 
 def calculate_total_sales(weekly_sales):
@@ -103,25 +196,127 @@ def calculate_average_sales(weekly_sales):
     return [sum(week) / len(week) for week in weekly_sales]
     # Generates a list of the answers for each week.
 
+
+def create_sales_summary(weekly_sales):
+    """
+    Build running sales aggregates from the weekly sales data.
+    The sales are summed once here; add_sale and update_sale then keep the
+    totals up to date so dashboard reads never have to re-sum the data.
+    """
+    week_totals = [sum(week) for week in weekly_sales]
+    return {
+        'total': sum(week_totals),
+        'count': sum(len(week) for week in weekly_sales),
+        'week_totals': week_totals,
+        'week_counts': [len(week) for week in weekly_sales],
+    }
+
+
+def add_sale(employee, week, amount):
+    """
+    Append a sale to a week (0-based) and update the running aggregates.
+    Passing week == number of weeks starts a new week.
+    """
+    sales = employee['sales']
+    summary = employee['sales_summary']
+    if week == len(sales):
+        sales.append([])
+        summary['week_totals'].append(0)
+        summary['week_counts'].append(0)
+    sales[week].append(amount)
+    summary['total'] += amount
+    summary['count'] += 1
+    summary['week_totals'][week] += amount
+    summary['week_counts'][week] += 1
+    return employee
+
+
+def update_sale(employee, week, index, amount):
+    """Replace a single sale and adjust the running aggregates by the difference."""
+    week_sales = employee['sales'][week]
+    difference = amount - week_sales[index]
+    week_sales[index] = amount
+    summary = employee['sales_summary']
+    summary['total'] += difference
+    summary['week_totals'][week] += difference
+    return employee
+
+
+def get_total_sales(employee):
+    """Return the total sales for all weeks from the running aggregates."""
+    return employee['sales_summary']['total']
+
+
+def get_week_average(employee, week):
+    """Return the average sale for one week from the running aggregates."""
+    summary = employee['sales_summary']
+    return summary['week_totals'][week] / summary['week_counts'][week]
+
+
+def get_average_sales(employee):
+    """Return the average sales for each week from the running aggregates."""
+    summary = employee['sales_summary']
+    return [total / count
+            for total, count in zip(summary['week_totals'], summary['week_counts'])]
+
+
+def verify_sales_summary(employee):
+    """Check the running aggregates against a full recomputation of the sales."""
+    weekly_sales = employee['sales']
+    expected_total = calculate_total_sales(weekly_sales)
+    expected_averages = calculate_average_sales(weekly_sales)
+    return (math.isclose(get_total_sales(employee), expected_total)
+            and len(get_average_sales(employee)) == len(expected_averages)
+            and all(math.isclose(average, expected)
+                    for average, expected in zip(get_average_sales(employee),
+                                                 expected_averages)))
+
 # Step 3: Dictionaries (Employee Information)
 
+# Every employee gets a unique ID, which the hobby index uses instead of the name
+employee_ids = itertools.count(1)
+
+
 def create_employee(first_name, last_name, age, department, address, hobbies, sales):
-    """Create a dictionary for storing employee details including sales data."""
+    """
+    Create a dictionary for storing employee details including sales data.
+    The employee gets their own copy of the hobby set, so later changes to the
+    caller's set cannot put the hobby index out of step.
+    """
     full_name = create_full_name(first_name, last_name)
+    if isinstance(hobbies, dict):
+        hobbies = dict(hobbies)
+    else:
+        hobbies = create_hobby_set(hobbies)
     employee = {
+        'id': next(employee_ids),
         'name': full_name,
         'age': age,
         'department': department,
         'address': address,
         'hobbies': hobbies,
-        'sales': sales  # Added sales data
+        'sales': sales,  # Added sales data
+        'sales_summary': create_sales_summary(sales)
     }
+    index_employee_hobbies(employee)
     return employee
 
 
 def update_employee_info(employee, key, value):
     """Update a specific key-value pair in the employee dictionary."""
-    employee[key] = value
+    if key == 'hobbies':
+        # Re-index so the hobby -> employees index stays consistent
+        unindex_employee_hobbies(employee)
+        if not isinstance(value, dict):
+            value = create_hobby_set(value)
+        employee[key] = value
+        index_employee_hobbies(employee)
+    elif key == 'sales':
+        # New sales data needs fresh running aggregates
+        employee[key] = value
+        employee['sales_summary'] = create_sales_summary(value)
+    else:
+        employee[key] = value
     return employee
 
 
@@ -156,7 +351,7 @@ def main():
     # Print output header
     print("========= Employee Onboarding ========\n")
     # Initialise hobbies list and weekly sales data for the employee
-    hobbies = ['reading', 'travelling', 'cycling', 'cooking']
+    hobbies = create_hobby_set(['reading', 'travelling', 'cycling', 'cooking'])
     weekly_sales = [
         [100, 200, 150],  # Week 1
         [250, 300, 200],  # Week 2
@@ -192,6 +387,15 @@ def main():
     # Print the average sales for each week
     for i, avg_sales in enumerate(average_sales, 1):
         print(f"Average Sales for Week {i}: {avg_sales}")
+
+    # Record new sales; the running aggregates are updated without re-summing
+    add_sale(employee, 2, 500)
+    update_sale(employee, 0, 1, 250)
+    add_sale(employee, 3, 275)
+    print()
+    print(f"Updated Total Sales: {get_total_sales(employee)}")
+    print(f"Updated Average Sales: {get_average_sales(employee)}")
+    print(f"Running aggregates match recomputation: {verify_sales_summary(employee)}")
     
     # Update employee department and address
     employee = update_employee_info(employee, 'department', 'Sales')
@@ -209,6 +413,14 @@ def main():
     print()
     display_employee_keys(employee)
     display_employee_values(employee)
+
+    # Match employees with shared hobbies
+    colleague = create_employee("Jane", "Smith", 28, 'Sales', '789 Pine Street',
+                                ['cycling', 'painting', 'chess'], [[120, 180]])
+    add_employee_hobby(colleague, 'reading')
+    print()
+    print(f"Employees who enjoy cycling: {find_employees_by_hobby('cycling')}")
+    print(f"Hobby matches for {employee['name']}: {find_hobby_matches(employee)}")
     
 
 # Run the main function to execute the onboarding system
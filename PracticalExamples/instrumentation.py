@@ -0,0 +1,184 @@
+"""
+Instrumentation for the practical examples: call timings and counters, kept in a
+metrics registry and saved as Prometheus text or JSON.
+
+Decorate a function or method with @instrumented("name") to record how long each
+call takes in the histogram name_seconds, and count the calls that raise an
+exception in name_errors_total.
+
+Instrumentation is off unless the METRICS environment variable is set to a file
+name when the program starts:
+
+    METRICS=metrics.prom python car-management-system.py   # Prometheus text format
+    METRICS=metrics.json python car-management-system.py   # JSON
+
+The metrics are then written to that file when the program exits. When it is off,
+@instrumented hands back the undecorated function, so the examples run exactly as
+fast as they did without it. Code that wants metrics without the environment
+variable can call metrics.enable() before the decorated code is imported.
+"""
+
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from bisect import bisect_left
+
+# Upper bounds, in seconds, of the histogram buckets: 10 microseconds to 10 seconds
+DEFAULT_BUCKETS = (0.00001, 0.0001, 0.001, 0.01, 0.1, 1.0, 10.0)
+
+
+class Counter:
+    """A number that only goes up, such as the number of failed calls."""
+
+    kind = "counter"
+
+    def __init__(self, name, help=""):
+        self.name = name
+        self.help = help
+        self.value = 0
+        self.lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def to_dict(self):
+        return {"type": self.kind, "help": self.help, "value": self.value}
+
+    def to_prometheus(self):
+        return [f"{self.name} {self.value}"]
+
+
+class Histogram:
+    """Counts observations (such as call durations) in buckets, plus their count and sum."""
+
+    kind = "histogram"
+
+    def __init__(self, name, help="", buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)  # The last bucket is everything larger
+        self.sum = 0.0
+        self.lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)  # First bucket whose bound is >= value
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    @property
+    def count(self):
+        return sum(self.counts)
+
+    def to_dict(self):
+        return {"type": self.kind, "help": self.help, "count": self.count, "sum": self.sum,
+                "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts))}
+
+    def to_prometheus(self):
+        # Prometheus buckets are cumulative: each one counts everything up to its bound
+        lines = []
+        total = 0
+        for bound, count in zip([*map(repr, self.buckets), "+Inf"], self.counts):
+            total += count
+            lines.append(f'{self.name}_bucket{{le="{bound}"}} {total}')
+        lines.append(f"{self.name}_sum {self.sum}")
+        lines.append(f"{self.name}_count {self.count}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds every metric by name, and saves them as Prometheus text or JSON."""
+
+    def __init__(self):
+        self.enabled = False
+        self.metrics = {}
+        self.lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        # Decorated functions keep their wrapper but stop recording
+        self.enabled = False
+
+    def get(self, metric_class, name, help, **options):
+        """Return the metric with this name, creating it the first time."""
+        with self.lock:
+            metric = self.metrics.get(name)
+            if metric is None:
+                metric = self.metrics[name] = metric_class(name, help, **options)
+            elif not isinstance(metric, metric_class):
+                raise ValueError(f"Metric {name!r} is already a {metric.kind}.")
+            return metric
+
+    def counter(self, name, help=""):
+        return self.get(Counter, name, help)
+
+    def histogram(self, name, help="", buckets=DEFAULT_BUCKETS):
+        return self.get(Histogram, name, help, buckets=buckets)
+
+    def reset(self):
+        with self.lock:
+            self.metrics.clear()
+
+    def to_json(self):
+        return json.dumps({name: metric.to_dict() for name, metric in sorted(self.metrics.items())},
+                          indent=4)
+
+    def to_prometheus(self):
+        lines = []
+        for name, metric in sorted(self.metrics.items()):
+            if metric.help:
+                lines.append(f"# HELP {name} {metric.help}")
+            lines.append(f"# TYPE {name} {metric.kind}")
+            lines.extend(metric.to_prometheus())
+        return "\n".join(lines) + "\n"
+
+    def dump(self, filename):
+        """Save the metrics: JSON if the file name ends in .json, otherwise Prometheus text."""
+        text = self.to_json() if filename.endswith(".json") else self.to_prometheus()
+        with open(filename, "w") as file:
+            file.write(text)
+
+
+# The registry shared by all the examples
+metrics = MetricsRegistry()
+
+METRICS_FILE = os.environ.get("METRICS")
+if METRICS_FILE:
+    metrics.enable()
+    atexit.register(metrics.dump, METRICS_FILE)
+
+
+def instrumented(name, registry=metrics):
+    """
+    Decorator that times every call in the histogram name_seconds and counts
+    failed calls in name_errors_total. Does nothing if the registry is disabled
+    when the function is decorated.
+    """
+    def decorate(function):
+        if not registry.enabled:
+            return function  # No wrapper at all, so no overhead
+        duration = registry.histogram(f"{name}_seconds", f"Time spent in {function.__qualname__}")
+        errors = registry.counter(f"{name}_errors_total", f"Failed calls to {function.__qualname__}")
+        perf_counter = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not registry.enabled:
+                return function(*args, **kwargs)
+            start = perf_counter()
+            try:
+                return function(*args, **kwargs)
+            except Exception:
+                errors.inc()
+                raise
+            finally:
+                duration.observe(perf_counter() - start)
+        return wrapper
+    return decorate
@@ -1,3 +1,19 @@
+import asyncio
+import bisect
+import heapq
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from datetime import date, timedelta
+
+from instrumentation import instrumented
+
+
 # Define a class for books in the library.
 class Book:
     def __init__(self, title, author, copies):
@@ -19,15 +35,738 @@ class Book:
         return self.copies > 0
 
 
-# A global dictionary to store books by their titles.
-library = {}
+# Define a class for the library catalogue.
+class Library:
+    def __init__(self, lock_count=16):
+        """
+        Initialize an empty library catalogue.
+        Books are keyed by their case-folded title, so lookups ignore case.
+        Three indexes are kept alongside the books:
+        - author_index: case-folded author -> ordered set (dict) of title keys
+        - title_index: sorted list of title keys, used for prefix search
+        - available: ordered set (dict) of title keys with at least one copy
+        Copy counts are protected by a set of striped locks: each title uses
+        the lock chosen by its hash, so threads working on different titles
+        rarely wait for each other. catalogue_lock guards the books and the
+        author and title indexes, and available_lock guards the availability
+        index. available_lock is always taken last, so it never waits on the
+        others. Readers copy what they need under the lock and build their
+        results outside it.
+        :param lock_count: int, the number of lock stripes
+        """
+        self.books = {}
+        self.author_index = {}
+        self.title_index = []
+        self.available = {}
+        self.catalogue_lock = threading.Lock()
+        self.available_lock = threading.Lock()
+        self.locks = [threading.Lock() for _ in range(lock_count)]
+
+    @staticmethod
+    def make_key(text):
+        """
+        Normalise a title or author name for case-insensitive lookup.
+        :param text: str, the title or author name
+        :return: str, the lookup key
+        """
+        return text.strip().casefold()
+
+    def lock_for(self, key):
+        """
+        Pick the lock stripe that guards a title.
+        :param key: str, the title key
+        :return: threading.Lock
+        """
+        return self.locks[hash(key) % len(self.locks)]
+
+    def add_book(self, book):
+        """
+        Add a book to the catalogue, replacing any book with the same title.
+        :param book: Book, the book to add
+        """
+        key = self.make_key(book.title)
+        with self.catalogue_lock, self.lock_for(key):
+            old_book = self.books.get(key)
+            self.books[key] = book  # Before the title index, so every indexed title has a book
+            if old_book is None:
+                bisect.insort(self.title_index, key)
+            else:
+                self.author_index[self.make_key(old_book.author)].pop(key, None)
+            self.author_index.setdefault(self.make_key(book.author), {})[key] = None
+            with self.available_lock:
+                if book.copy_in_library():
+                    self.available[key] = None
+                else:
+                    self.available.pop(key, None)
+
+    def add_books(self, books):
+        """
+        Add many books at once, replacing any books with the same titles.
+        add_book inserts each new title into the sorted title index, which
+        costs O(n) per title; here the new titles are appended and the index
+        is sorted once, so loading a large catalogue takes O(n log n).
+        :param books: iterable of Book
+        """
+        new_keys = []
+        with self.catalogue_lock:
+            for book in books:
+                key = self.make_key(book.title)
+                with self.lock_for(key):
+                    old_book = self.books.get(key)
+                    if old_book is None:
+                        new_keys.append(key)
+                    else:
+                        self.author_index[self.make_key(old_book.author)].pop(key, None)
+                    self.books[key] = book
+                    self.author_index.setdefault(self.make_key(book.author), {})[key] = None
+                    with self.available_lock:
+                        if book.copy_in_library():
+                            self.available[key] = None
+                        else:
+                            self.available.pop(key, None)
+            self.title_index.extend(new_keys)
+            self.title_index.sort()
+
+    def get_book(self, title):
+        """
+        Find a book by its title, ignoring case.
+        :param title: str, the title of the book
+        :return: Book, or None if the title is not in the catalogue
+        """
+        return self.books.get(self.make_key(title))
+
+    def find_by_author(self, author):
+        """
+        Find all books written by an author, ignoring case.
+        :param author: str, the author's name
+        :return: list of Book
+        """
+        with self.catalogue_lock:
+            keys = list(self.author_index.get(self.make_key(author), {}))
+        return [self.books[key] for key in keys]
+
+    def search_titles(self, prefix, limit=None):
+        """
+        Find books whose title starts with a prefix, in title order.
+        A binary search on the sorted title index finds the first match, so
+        only the matching titles are visited.
+        :param prefix: str, the start of the title
+        :param limit: int, the maximum number of books to return (optional)
+        :return: list of Book
+        """
+        prefix = self.make_key(prefix)
+        results = []
+        with self.catalogue_lock:
+            position = bisect.bisect_left(self.title_index, prefix)
+            while position < len(self.title_index) and (limit is None or len(results) < limit):
+                key = self.title_index[position]
+                if not key.startswith(prefix):
+                    break
+                results.append(self.books[key])
+                position += 1
+        return results
+
+    def borrow(self, title):
+        """
+        Take one copy of a book out of the library.
+        Copies should be changed through borrow and return_book so the
+        availability index stays in step with Book.copies. The check and the
+        decrement happen under the title's lock, so concurrent borrowers can
+        never take more copies than exist. The method never awaits, so it is
+        also atomic with respect to other asyncio tasks.
+        :param title: str, the title of the book
+        :return: Book, or None if the book does not exist or has no copies left
+        """
+        key = self.make_key(title)
+        book = self.books.get(key)
+        if book is None:
+            return None
+        with self.lock_for(key):
+            if not book.copy_in_library():
+                return None
+            book.copies -= 1
+            if not book.copy_in_library():
+                with self.available_lock:
+                    self.available.pop(key, None)
+        return book
+
+    def return_book(self, title):
+        """
+        Put one copy of a book back into the library.
+        :param title: str, the title of the book
+        :return: Book, or None if the book does not exist
+        """
+        key = self.make_key(title)
+        book = self.books.get(key)
+        if book is None:
+            return None
+        with self.lock_for(key), self.available_lock:
+            book.copies += 1
+            self.available[key] = None
+        return book
+
+    def available_books(self):
+        """
+        List the books with at least one copy in the library.
+        Only the availability index is visited, not the whole catalogue.
+        :return: list of Book
+        """
+        with self.available_lock:
+            keys = list(self.available)
+        return [self.books[key] for key in keys]
+
+    def available_count(self):
+        """
+        Count the titles with at least one copy in the library.
+        :return: int
+        """
+        return len(self.available)
+
+    def items(self):
+        """
+        Iterate over (title, book) pairs in insertion order.
+        """
+        with self.catalogue_lock:
+            books = list(self.books.values())
+        for book in books:
+            yield book.title, book
+
+    def __setitem__(self, title, book):
+        self.add_book(book)
+
+    def __getitem__(self, title):
+        book = self.get_book(title)
+        if book is None:
+            raise KeyError(title)
+        return book
+
+    def is_empty(self):
+        """
+        Check if the catalogue holds no books.
+        :return: bool
+        """
+        return not self.books
+
+    def __contains__(self, title):
+        return self.make_key(title) in self.books
+
+    def __len__(self):
+        return len(self.books)
+
+
+# Define a library whose catalogue is saved in an SQLite database file.
+class PersistentLibrary(Library):
+    def __init__(self, path, cache_size=1024, lock_count=16):
+        """
+        Open (or create) a catalogue stored in an SQLite database file.
+        Nothing is loaded up front: books are read from the database when they
+        are first looked up, and the most recently used ones are kept in an
+        LRU cache, so start-up time does not depend on the catalogue size.
+        The database indexes take the place of the in-memory indexes:
+        - the primary key on the title key serves lookups and prefix search
+        - books_author serves author search
+        - books_available (a partial index) serves the available books
+        :param path: str, the path of the database file
+        Every Book handed out is also kept in live_books (by weak reference),
+        so a book dropped from the cache but still held somewhere is reused
+        rather than loaded a second time. cache_lock guards the cache and
+        live_books; it is never taken while db_lock is held.
+        :param cache_size: int, the number of books to keep in memory
+        :param lock_count: int, the number of lock stripes
+        """
+        super().__init__(lock_count)
+        self.connection = sqlite3.connect(path, check_same_thread=False,
+                                          isolation_level=None)
+        self.db_lock = threading.Lock()
+        self.cache = OrderedDict()
+        self.cache_size = cache_size
+        self.live_books = weakref.WeakValueDictionary()
+        self.cache_lock = threading.RLock()
+        self.connection.executescript("""
+            CREATE TABLE IF NOT EXISTS books (
+                key TEXT PRIMARY KEY,
+                title TEXT NOT NULL,
+                author TEXT NOT NULL,
+                author_key TEXT NOT NULL,
+                copies INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS books_author ON books (author_key);
+            CREATE INDEX IF NOT EXISTS books_available ON books (key) WHERE copies > 0;
+        """)
+
+    def close(self):
+        """
+        Close the database file.
+        """
+        with self.db_lock:
+            self.connection.close()
+
+    def query(self, sql, parameters=()):
+        """
+        Run a query and fetch all of its rows.
+        :param sql: str, the SQL statement
+        :param parameters: tuple, the values for the statement's placeholders
+        :return: list of tuple
+        """
+        with self.db_lock:
+            return self.connection.execute(sql, parameters).fetchall()
+
+    def materialize(self, key, title, author, copies):
+        """
+        Return the Book for a database row, reusing the Book already in memory
+        (cached, or still referenced elsewhere) if there is one.
+        :return: Book
+        """
+        with self.cache_lock:
+            book = self.cache.get(key)
+            if book is not None:
+                self.cache.move_to_end(key)
+                return book
+            book = self.live_books.get(key)
+            if book is None:
+                book = Book(title, author, copies)
+                self.live_books[key] = book
+            self.cache[key] = book
+            if len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)  # Drop the least recently used book
+            return book
+
+    def refresh(self, key, title, author, copies):
+        """
+        Bring the in-memory Book for a title (if there is one) in line with a
+        row that has just been written to the database.
+        """
+        with self.cache_lock:
+            book = self.live_books.get(key)
+            if book is not None:
+                book.title, book.author, book.copies = title, author, copies
+
+    def add_book(self, book):
+        """
+        Add a book to the catalogue, replacing any book with the same title.
+        :param book: Book, the book to add
+        """
+        key = self.make_key(book.title)
+        with self.lock_for(key):
+            with self.db_lock:
+                self.connection.execute(
+                    "INSERT OR REPLACE INTO books VALUES (?, ?, ?, ?, ?)",
+                    (key, book.title, book.author, self.make_key(book.author), book.copies))
+            self.refresh(key, book.title, book.author, book.copies)
+            self.materialize(key, book.title, book.author, book.copies)
+
+    def add_books(self, books):
+        """
+        Add many books in a single transaction, without caching them.
+        :param books: iterable of Book
+        """
+        rows = [(self.make_key(book.title), book.title, book.author,
+                 self.make_key(book.author), book.copies) for book in books]
+        with self.db_lock:
+            self.connection.execute("BEGIN")
+            self.connection.executemany("INSERT OR REPLACE INTO books VALUES (?, ?, ?, ?, ?)", rows)
+            self.connection.execute("COMMIT")
+        with self.cache_lock:
+            for key, title, author, _, copies in rows:
+                self.refresh(key, title, author, copies)
+
+    def get_book(self, title):
+        """
+        Find a book by its title, ignoring case.
+        :param title: str, the title of the book
+        :return: Book, or None if the title is not in the catalogue
+        """
+        key = self.make_key(title)
+        # Held across the lookup and the load, so two threads missing the
+        # cache at once cannot both create a Book for the same title
+        with self.cache_lock:
+            book = self.cache.get(key)
+            if book is not None:
+                self.cache.move_to_end(key)
+                return book
+            rows = self.query("SELECT key, title, author, copies FROM books WHERE key = ?", (key,))
+            return self.materialize(*rows[0]) if rows else None
+
+    def find_by_author(self, author):
+        """
+        Find all books written by an author, ignoring case.
+        :param author: str, the author's name
+        :return: list of Book
+        """
+        rows = self.query("SELECT key, title, author, copies FROM books "
+                          "WHERE author_key = ? ORDER BY rowid", (self.make_key(author),))
+        return [self.materialize(*row) for row in rows]
+
+    def search_titles(self, prefix, limit=None):
+        """
+        Find books whose title starts with a prefix, in title order.
+        :param prefix: str, the start of the title
+        :param limit: int, the maximum number of books to return (optional)
+        :return: list of Book
+        """
+        prefix = self.make_key(prefix)
+        rows = self.query("SELECT key, title, author, copies FROM books "
+                          "WHERE key >= ? AND key < ? ORDER BY key LIMIT ?",
+                          (prefix, prefix + "\U0010ffff", -1 if limit is None else limit))
+        return [self.materialize(*row) for row in rows]
+
+    def change_copies(self, title, change):
+        """
+        Add to (or take from) the copy count of a book in the database,
+        never letting it drop below zero.
+        :param title: str, the title of the book
+        :param change: int, the number of copies to add (negative to take)
+        :return: Book, or None if the book does not exist or has too few copies
+        """
+        book = self.get_book(title)
+        if book is None:
+            return None
+        key = self.make_key(title)
+        with self.lock_for(key), self.db_lock:
+            cursor = self.connection.execute(
+                "UPDATE books SET copies = copies + ? WHERE key = ? AND copies + ? >= 0",
+                (change, key, change))
+            if cursor.rowcount == 0:
+                return None
+            book.copies = self.connection.execute(
+                "SELECT copies FROM books WHERE key = ?", (key,)).fetchone()[0]
+        return book
+
+    def borrow(self, title):
+        """
+        Take one copy of a book out of the library.
+        :param title: str, the title of the book
+        :return: Book, or None if the book does not exist or has no copies left
+        """
+        return self.change_copies(title, -1)
+
+    def return_book(self, title):
+        """
+        Put one copy of a book back into the library.
+        :param title: str, the title of the book
+        :return: Book, or None if the book does not exist
+        """
+        return self.change_copies(title, 1)
+
+    def available_books(self):
+        """
+        List the books with at least one copy in the library.
+        :return: list of Book
+        """
+        rows = self.query("SELECT key, title, author, copies FROM books "
+                          "WHERE copies > 0 ORDER BY rowid")
+        return [self.materialize(*row) for row in rows]
+
+    def available_count(self):
+        """
+        Count the titles with at least one copy in the library.
+        :return: int
+        """
+        return self.query("SELECT COUNT(*) FROM books WHERE copies > 0")[0][0]
+
+    def items(self):
+        """
+        Iterate over (title, book) pairs in insertion order.
+        Books that are not already cached are not added to the cache, so a
+        full listing does not push the hot titles out.
+        """
+        for key, title, author, copies in self.query(
+                "SELECT key, title, author, copies FROM books ORDER BY rowid"):
+            with self.cache_lock:
+                book = self.live_books.get(key)
+                if book is None:
+                    book = self.live_books[key] = Book(title, author, copies)
+            yield title, book
+
+    def is_empty(self):
+        """
+        Check if the catalogue holds no books.
+        Stops at the first row, unlike len(), which counts the whole table.
+        :return: bool
+        """
+        return not self.query("SELECT 1 FROM books LIMIT 1")
+
+    def __bool__(self):
+        return not self.is_empty()
+
+    def __contains__(self, title):
+        return self.get_book(title) is not None
+
+    def __len__(self):
+        return self.query("SELECT COUNT(*) FROM books")[0][0]
+
+
+# Define a class for a single loan of a book.
+class Loan:
+    def __init__(self, loan_id, member, title, due_date):
+        """
+        Initialize a loan record.
+        :param loan_id: int, the unique loan number
+        :param member: str, the name of the member who borrowed the book
+        :param title: str, the title of the borrowed book
+        :param due_date: date, the day the book must be returned by
+        """
+        self.loan_id = loan_id
+        self.member = member
+        self.title = title
+        self.due_date = due_date
+
+    def is_overdue(self, today):
+        """
+        Check if the loan is past its due date.
+        :param today: date, the current day
+        :return: bool, True if the due date has passed
+        """
+        return self.due_date < today
+
+
+# Define a class for the record of all open loans.
+class LoanLedger:
+    def __init__(self, log_path=None):
+        """
+        Initialize an empty loan ledger.
+        - loans: loan ID -> Loan, for every open loan
+        - member_loans: member -> ordered set (dict) of their open loan IDs
+        - due_heap: min-heap of (due date, loan ID), so the earliest due loan
+          is always at the front. Returned loans are left in the heap and
+          skipped when they are reached, and the heap is rebuilt once more
+          than half of it is stale.
+        Every change is appended to a log file (one JSON object per line), which
+        is replayed on start-up to restore the open loans. Once the log holds
+        more than twice as many entries as there are open loans, compact()
+        replaces it with a snapshot of the open loans, so start-up time depends
+        on the loans that are open rather than on every loan ever made.
+        All changes and reads happen under one lock, so concurrent borrowers
+        each get their own loan ID.
+        :param log_path: str, the path of the loan log file (optional)
+        """
+        self.loans = {}
+        self.member_loans = {}
+        self.due_heap = []
+        self.next_loan_id = 1
+        self.log_path = None
+        self.log_file = None
+        self.log_entries = 0  # Number of entries in the log file
+        self.lock = threading.RLock()
+        if log_path is not None:
+            self.open_log(log_path)
+
+    def open_log(self, log_path):
+        """
+        Replay an existing loan log and append all further changes to it.
+        :param log_path: str, the path of the loan log file
+        """
+        with self.lock:
+            if os.path.exists(log_path):
+                with open(log_path, "r") as file:
+                    for line in file:
+                        if line.strip():
+                            self.apply(json.loads(line))
+                            self.log_entries += 1
+            self.log_path = log_path
+            self.log_file = open(log_path, "a")
+            if self.log_is_stale():
+                self.compact()
+
+    def close(self):
+        """
+        Close the loan log file.
+        """
+        with self.lock:
+            if self.log_file is not None:
+                self.log_file.close()
+                self.log_file = None
+
+    def apply(self, entry):
+        """
+        Apply one log entry to the ledger.
+        :param entry: dict, a "lend", "return" or "next_id" entry
+        :return: Loan, the loan that was opened or closed (or None)
+        """
+        if entry["op"] == "next_id":  # Written at the start of a snapshot
+            self.next_loan_id = max(self.next_loan_id, entry["id"])
+            return None
+        if entry["op"] == "lend":
+            loan = Loan(entry["id"], entry["member"], entry["title"],
+                        date.fromisoformat(entry["due"]))
+            self.loans[loan.loan_id] = loan
+            self.member_loans.setdefault(loan.member, {})[loan.loan_id] = None
+            heapq.heappush(self.due_heap, (loan.due_date, loan.loan_id))
+            self.next_loan_id = max(self.next_loan_id, loan.loan_id + 1)
+            return loan
+        loan = self.loans.pop(entry["id"], None)
+        if loan is not None:
+            self.member_loans[loan.member].pop(loan.loan_id, None)
+            if len(self.due_heap) > 2 * len(self.loans) + 16:
+                self.rebuild_heap()
+        return loan
+
+    def record(self, entry):
+        """
+        Apply a log entry and append it to the log file.
+        :param entry: dict, a "lend" or "return" entry
+        :return: Loan, the loan that was opened or closed (or None)
+        """
+        with self.lock:
+            loan = self.apply(entry)
+            if self.log_file is not None:
+                self.log_file.write(json.dumps(entry) + "\n")
+                self.log_file.flush()
+                self.log_entries += 1
+                if self.log_is_stale():
+                    self.compact()
+            return loan
+
+    def log_is_stale(self):
+        """
+        Check if the log holds many more entries than a snapshot would.
+        :return: bool
+        """
+        return self.log_entries > 2 * len(self.loans) + 16
+
+    def rebuild_heap(self):
+        """
+        Rebuild the due-date heap without the loans that have been returned.
+        """
+        self.due_heap = [(loan.due_date, loan.loan_id) for loan in self.loans.values()]
+        heapq.heapify(self.due_heap)
+
+    def compact(self):
+        """
+        Rebuild the due-date heap and, if a log file is open, replace the log
+        with a snapshot: the next loan ID followed by one "lend" entry per open
+        loan. The snapshot is written to a temporary file first and then moved
+        over the log, so a crash part-way through leaves the old log intact.
+        """
+        with self.lock:
+            self.rebuild_heap()
+            if self.log_file is None:
+                return
+            snapshot_path = self.log_path + ".tmp"
+            with open(snapshot_path, "w") as file:
+                file.write(json.dumps({"op": "next_id", "id": self.next_loan_id}) + "\n")
+                for loan in self.loans.values():
+                    file.write(json.dumps({"op": "lend", "id": loan.loan_id, "member": loan.member,
+                                           "title": loan.title,
+                                           "due": loan.due_date.isoformat()}) + "\n")
+            self.log_file.close()
+            os.replace(snapshot_path, self.log_path)
+            self.log_file = open(self.log_path, "a")
+            self.log_entries = len(self.loans) + 1
+
+    def lend(self, member, title, due_date):
+        """
+        Record that a member has borrowed a book.
+        :param member: str, the member's name
+        :param title: str, the title of the book
+        :param due_date: date, the day the book must be returned by
+        :return: Loan, the new loan
+        """
+        # The lock is held from reading next_loan_id until the loan is applied
+        with self.lock:
+            return self.record({"op": "lend", "id": self.next_loan_id, "member": member,
+                                "title": title, "due": due_date.isoformat()})
+
+    def return_loan(self, member, title):
+        """
+        Close a member's oldest open loan of a book, ignoring case in the title.
+        :param member: str, the member's name
+        :param title: str, the title of the book
+        :return: Loan, the closed loan, or None if no matching loan is open
+        """
+        key = Library.make_key(title)
+        with self.lock:
+            for loan_id in self.member_loans.get(member, {}):
+                if Library.make_key(self.loans[loan_id].title) == key:
+                    return self.record({"op": "return", "id": loan_id})
+        return None
+
+    def loans_for(self, member):
+        """
+        List a member's open loans.
+        :param member: str, the member's name
+        :return: list of Loan
+        """
+        with self.lock:
+            return [self.loans[loan_id] for loan_id in self.member_loans.get(member, {})]
+
+    def overdue(self, today=None):
+        """
+        List every open loan that is past its due date, earliest first.
+        The heap is walked from the front and a branch is abandoned as soon as
+        it reaches a loan that is not yet due, so only the overdue part of the
+        heap is visited: O(k log k) for k overdue loans.
+        :param today: date, the current day (defaults to today)
+        :return: list of Loan
+        """
+        today = today or date.today()
+        found = []
+        stack = [0]
+        with self.lock:
+            while stack:
+                position = stack.pop()
+                if position >= len(self.due_heap):
+                    continue
+                due_date, loan_id = self.due_heap[position]
+                if due_date >= today:
+                    continue
+                if loan_id in self.loans:
+                    found.append((due_date, loan_id))
+                stack.extend((2 * position + 1, 2 * position + 2))
+            found.sort()
+            return [self.loans[loan_id] for _, loan_id in found]
+
+    def next_due(self, count):
+        """
+        List the open loans that are due soonest, earliest first.
+        A second, small heap holds the frontier of the due-date heap, so only
+        about 2 * count entries are examined: O(count log count).
+        :param count: int, the number of loans to return
+        :return: list of Loan
+        """
+        with self.lock:
+            found = []
+            frontier = [(self.due_heap[0], 0)] if self.due_heap else []
+            while frontier and len(found) < count:
+                (due_date, loan_id), position = heapq.heappop(frontier)
+                if loan_id in self.loans:
+                    found.append(self.loans[loan_id])
+                for child in (2 * position + 1, 2 * position + 2):
+                    if child < len(self.due_heap):
+                        heapq.heappush(frontier, (self.due_heap[child], child))
+            return found
+
+    def __len__(self):
+        return len(self.loans)
+
+
+# A global catalogue to store books by their titles.
+library = Library()
+
+# A global ledger of who has borrowed which book.
+ledger = LoanLedger()
+
+
+# Function to choose the loan log that goes with a catalogue file.
+def loan_log_for(catalogue_path):
+    """
+    Name the loan log kept next to a catalogue database, e.g. library.db ->
+    library-loans.jsonl. Loans are only saved alongside a saved catalogue, so
+    the copy counts and the open loans always come from the same place.
+    :param catalogue_path: str, the path of the catalogue database
+    :return: str, the path of the loan log
+    """
+    return os.path.splitext(catalogue_path)[0] + "-loans.jsonl"
 
 
 # Function to populate the library with initial data.
 def populate_library():
     """
     Populate the library dictionary with a set of predefined books.
+    A catalogue loaded from a file that already holds books is left as it is.
     """
+    if not library.is_empty():
+        return
     library["Atomic Habits"] = Book("Atomic Habits", "James Clear", 5)
     library["Knotebook"] = Book("Knotebook", "Toby", 6)
     library["Brave New World"] = Book("Brave New World", "Aldous Huxley", 7)
@@ -35,6 +774,7 @@ def populate_library():
 
 
 # Function to list all books in the library.
+@instrumented("library_list_books")
 def list_books():
     """
     Display all books in the library, including their authors and number of copies.
@@ -46,49 +786,118 @@ def list_books():
 
 
 # Function to list all available books with copies > 0.
+@instrumented("library_list_available_books")
 def list_available_books():
     """
     Display only the books that have at least one copy available in the library.
     """
     print(f"{'Title':<30}{'Author':<20}{'Copies':<10}")
     print("-" * 60)
-    for title, book in library.items():
-        if book.copy_in_library():
-            print(f"{title:<30}{book.author:<20}{book.copies:<10}")
+    for book in library.available_books():
+        print(f"{book.title:<30}{book.author:<20}{book.copies:<10}")
+
+
+# Function to display a list of books as a table.
+def print_books(books):
+    """
+    Display the given books, including their authors and number of copies.
+    :param books: list of Book
+    """
+    if not books:
+        print("\nNo matching books found.")
+        return
+    print(f"{'Title':<30}{'Author':<20}{'Copies':<10}")
+    print("-" * 60)
+    for book in books:
+        print(f"{book.title:<30}{book.author:<20}{book.copies:<10}")
+
+
+# Function to search for books by the start of their title.
+@instrumented("library_search_books_by_title")
+def search_books_by_title(prefix):
+    """
+    Display all books whose title starts with the given text, ignoring case.
+    :param prefix: str, the start of the title
+    """
+    print_books(library.search_titles(prefix))
+
+
+# Function to search for books by author.
+@instrumented("library_search_books_by_author")
+def search_books_by_author(author):
+    """
+    Display all books written by the given author, ignoring case.
+    :param author: str, the author's name
+    """
+    print_books(library.find_by_author(author))
 
 
 # Function to borrow a book from the library.
-def borrow_a_book(title):
+@instrumented("library_borrow_a_book")
+def borrow_a_book(title, member=None, loan_days=14):
     """
     Borrow a book by reducing its available copy count by one.
+    If a member is given, the loan is recorded in the ledger with a due date.
     :param title: str, the title of the book to borrow
+    :param member: str, the name of the member borrowing the book (optional)
+    :param loan_days: int, the number of days until the book is due back
     """
-    if title in library and library[title].copy_in_library():
-        library[title].copies -= 1
-        print(f"\nYou have borrowed '{title}' by {library[title].author}.")
+    book = library.borrow(title)
+    if book is not None:
+        print(f"\nYou have borrowed '{book.title}' by {book.author}.")
+        if member:
+            loan = ledger.lend(member, book.title, date.today() + timedelta(days=loan_days))
+            print(f"Please return it by {loan.due_date.isoformat()}.")
     else:
         print("\nThat book is not available or does not exist.")
 
 
 # Function to return a borrowed book to the library.
-def return_a_book(title):
+@instrumented("library_return_a_book")
+def return_a_book(title, member=None):
     """
     Return a borrowed book by increasing its available copy count by one.
+    If a member is given, their loan of the book is closed in the ledger first,
+    and the copy is only put back if they had the book on loan.
     :param title: str, the title of the book to return
+    :param member: str, the name of the member returning the book (optional)
     """
-    if title in library:
-        library[title].copies += 1
-        print(f"\nYou have returned '{title}' by {library[title].author}.")
-    else:
+    book = library.get_book(title)
+    if book is None:
         print("\nThat book does not exist in the library.")
+        return
+    if member and ledger.return_loan(member, book.title) is None:
+        print(f"\n{member} has no open loan of '{book.title}'.")
+        return
+    library.return_book(title)
+    print(f"\nYou have returned '{book.title}' by {book.author}.")
+
+
+# Function to list the loans that are past their due date.
+@instrumented("library_list_overdue_loans")
+def list_overdue_loans():
+    """
+    Display every overdue loan, earliest due date first.
+    """
+    overdue_loans = ledger.overdue()
+    if not overdue_loans:
+        print("\nNo overdue loans.")
+        return
+    print(f"{'Member':<20}{'Title':<30}{'Due':<12}")
+    print("-" * 62)
+    for loan in overdue_loans:
+        print(f"{loan.member:<20}{loan.title:<30}{loan.due_date.isoformat():<12}")
 
 
 # Main Menu
-def main_menu():
+def main_menu(loan_log=None):
     """
     Display the main menu and allow the user to interact with the library system.
+    :param loan_log: str, the loan log to replay and save loans to (optional)
     """
     populate_library()
+    if loan_log is not None:
+        ledger.open_log(loan_log)
 
     while True:
         print("\nLibrary Menu:")
@@ -96,7 +905,10 @@ def main_menu():
         print("2. List Available Books")
         print("3. Borrow a Book")
         print("4. Return a Book")
-        print("5. Quit")
+        print("5. Search Books by Title")
+        print("6. Search Books by Author")
+        print("7. List Overdue Loans")
+        print("8. Quit")
 
         choice = input("Enter the number of your choice: ").strip()
 
@@ -106,17 +918,118 @@ def main_menu():
             list_available_books()
         elif choice == '3':
             title = input("Enter the title of the book to borrow: ").strip()
-            borrow_a_book(title)
+            member = input("Enter your name: ").strip()
+            borrow_a_book(title, member)
         elif choice == '4':
             title = input("Enter the title of the book to return: ").strip()
-            return_a_book(title)
+            member = input("Enter your name: ").strip()
+            return_a_book(title, member)
         elif choice == '5':
+            prefix = input("Enter the start of the title: ").strip()
+            search_books_by_title(prefix)
+        elif choice == '6':
+            author = input("Enter the author's name: ").strip()
+            search_books_by_author(author)
+        elif choice == '7':
+            list_overdue_loans()
+        elif choice == '8':
+            ledger.close()
             print("Goodbye!")
             break
         else:
             print("Invalid choice. Please try again.")
 
 
+# Benchmark for concurrent borrowing.
+def benchmark_concurrent_borrowing(client_counts=(1, 2, 4, 8, 16), operations=20000,
+                                   title_count=64):
+    """
+    Measure borrow/return throughput as the number of concurrent clients grows,
+    and check that no copies are oversold.
+    Each client borrows and returns books in a loop; threads and asyncio tasks
+    are measured separately.
+    :param client_counts: tuple of int, the numbers of clients to try
+    :param operations: int, the total number of borrow/return pairs per run
+    :param title_count: int, the number of titles the clients spread over
+    """
+    titles = [f"Title {i}" for i in range(title_count)]
+
+    def make_library():
+        bench_library = Library()
+        for title in titles:
+            bench_library.add_book(Book(title, "Author", 10))
+        return bench_library
+
+    def client(bench_library, count, offset):
+        for i in range(count):
+            title = titles[(offset + i) % title_count]
+            if bench_library.borrow(title) is not None:
+                bench_library.return_book(title)
+
+    async def async_client(bench_library, count, offset):
+        for i in range(count):
+            title = titles[(offset + i) % title_count]
+            if bench_library.borrow(title) is not None:
+                await asyncio.sleep(0)  # Let other tasks run while the book is out
+                bench_library.return_book(title)
+
+    async def run_async_clients(bench_library, clients, per_client):
+        await asyncio.gather(*(async_client(bench_library, per_client, offset)
+                               for offset in range(clients)))
+
+    print(f"{'Clients':<10}{'Threads (ops/s)':<20}{'Asyncio (ops/s)':<20}")
+    print("-" * 50)
+    for clients in client_counts:
+        per_client = operations // clients
+
+        bench_library = make_library()
+        threads = [threading.Thread(target=client, args=(bench_library, per_client, offset))
+                   for offset in range(clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        thread_rate = per_client * clients / (time.perf_counter() - start)
+        assert all(book.copies == 10 for _, book in bench_library.items())
+
+        bench_library = make_library()
+        start = time.perf_counter()
+        asyncio.run(run_async_clients(bench_library, clients, per_client))
+        async_rate = per_client * clients / (time.perf_counter() - start)
+        assert all(book.copies == 10 for _, book in bench_library.items())
+
+        print(f"{clients:<10}{thread_rate:<20,.0f}{async_rate:<20,.0f}")
+
+    # Many threads racing for a few copies must never oversell
+    bench_library = Library()
+    bench_library.add_book(Book("Rare Book", "Author", 100))
+    borrowed = []
+
+    def greedy_client():
+        for _ in range(50):
+            if bench_library.borrow("Rare Book") is not None:
+                borrowed.append(1)
+
+    threads = [threading.Thread(target=greedy_client) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"\nOversell check: {len(borrowed)} of 100 copies borrowed, "
+          f"{bench_library['Rare Book'].copies} left")
+
+
 # Start the program
 if __name__ == "__main__":
-    main_menu()
+    loan_log = None
+    if "--catalogue" in sys.argv:
+        # Keep the catalogue in a database file, e.g. --catalogue library.db,
+        # and the loans in a log next to it
+        catalogue_path = sys.argv[sys.argv.index("--catalogue") + 1]
+        library = PersistentLibrary(catalogue_path)
+        loan_log = loan_log_for(catalogue_path)
+    if "--benchmark" in sys.argv:
+        benchmark_concurrent_borrowing()
+    else:
+        main_menu(loan_log)
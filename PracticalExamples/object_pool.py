@@ -0,0 +1,69 @@
+"""
+Object pooling for the practical examples.
+
+ObjectPool keeps objects that are no longer needed so they can be reused
+instead of allocating new ones, and GCMonitor measures how often the garbage
+collector runs and how long it pauses the program. Pooling is optional: the
+examples only use a pool when one is passed in (or switched on).
+"""
+
+import gc
+import time
+from itertools import islice
+
+
+class ObjectPool:
+    """Keeps released objects so they can be reused instead of allocating new ones."""
+
+    def __init__(self, factory, reset, max_size=100_000):
+        self.factory = factory    # Creates a new object from the given arguments
+        self.reset = reset        # Reset hook: gives a released object the new arguments
+        self.max_size = max_size  # Released objects beyond this are left to the garbage collector
+        self.free = []
+        self.created = 0
+        self.reused = 0
+
+    def acquire(self, *args, **kwargs):
+        """Return a released object reset with the arguments, or a new one if none are free."""
+        if self.free:
+            obj = self.free.pop()
+            self.reset(obj, *args, **kwargs)
+            self.reused += 1
+            return obj
+        self.created += 1
+        return self.factory(*args, **kwargs)
+
+    def release(self, obj):
+        """Hand an object back; nothing else may still be using it."""
+        if len(self.free) < self.max_size:
+            self.free.append(obj)
+
+    def release_all(self, objects):
+        """Hand a batch of objects back."""
+        self.free.extend(islice(objects, max(self.max_size - len(self.free), 0)))
+
+
+class GCMonitor:
+    """Records how many garbage collections run, and how long they pause, inside a with-block."""
+
+    def __init__(self):
+        self.pauses = []
+        self.started = None
+
+    def callback(self, phase, info):
+        if phase == "start":
+            self.started = time.perf_counter()
+        elif self.started is not None:
+            self.pauses.append(time.perf_counter() - self.started)
+
+    def __enter__(self):
+        gc.callbacks.append(self.callback)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        gc.callbacks.remove(self.callback)
+        return False
+
+    def total_pause(self):
+        """Total time spent in garbage collection, in seconds."""
+        return sum(self.pauses)
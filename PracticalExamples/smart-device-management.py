@@ -1,23 +1,117 @@
+import asyncio
+import bisect
+import io
+import itertools
+import random
+import sys
+import threading
+import time
+from array import array
+from contextlib import redirect_stdout
+from operator import add, mul, sub, truediv
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional; array.array and memoryview buffers work without it
+    numpy = None
+
+from counters import CounterValue, ShardedCounter
+
+
+# Temperature conversions for whole buffers of readings. Each is written as a
+# single comprehension (no function call per reading) with the same operations,
+# in the same order, as the scalar formula, so the results match it exactly.
+def celcius_to_fahrenheit_values(readings):
+    return [(reading * 9 / 5) + 32 for reading in readings]
+
+
+def fahrenheit_to_celcius_values(readings):
+    return [(reading - 32) * 5 / 9 for reading in readings]
+
+
+# The same conversions as in-place steps for NumPy arrays
+CELCIUS_TO_FAHRENHEIT = ((mul, 9), (truediv, 5), (add, 32))
+FAHRENHEIT_TO_CELCIUS = ((sub, 32), (mul, 5), (truediv, 9))
+
+
+# Readings converted per slice of an array.array, memoryview or list buffer
+CONVERT_CHUNK = 65536
+
+
+# Convert a whole buffer of readings in place.
+# NumPy arrays are updated with in-place ufuncs. array.array, memoryview and
+# list buffers are converted one slice of CONVERT_CHUNK readings at a time:
+# each slice is converted into a temporary list (and, for typed buffers, an
+# array) and written back with a slice assignment, so the temporary memory
+# stays the same however large the buffer is.
+def convert_readings(readings, convert_values, numpy_steps):
+    if numpy is not None and isinstance(readings, numpy.ndarray):
+        ufuncs = {add: numpy.add, sub: numpy.subtract, mul: numpy.multiply,
+                  truediv: numpy.true_divide}
+        for operation, constant in numpy_steps:
+            ufuncs[operation](readings, constant, out=readings)
+        return readings
+
+    if isinstance(readings, array):
+        typecode = readings.typecode
+    elif isinstance(readings, memoryview):
+        typecode = readings.format
+        if readings.readonly or readings.ndim != 1:
+            raise TypeError("Readings memoryview must be writable and one-dimensional.")
+    elif isinstance(readings, list):
+        typecode = None
+    else:
+        raise TypeError("Readings must be a NumPy array, array.array, memoryview or list.")
+    if typecode is not None and typecode not in ("d", "f"):
+        raise TypeError("Readings buffers must hold floats (typecode 'd' or 'f').")
+
+    for start in range(0, len(readings), CONVERT_CHUNK):
+        end = start + CONVERT_CHUNK
+        values = convert_values(readings[start:end])
+        readings[start:end] = values if typecode is None else array(typecode, values)
+    return readings
+
+
 class SmartDevice:
     # Class attributes
-    connected_devices = 0
-    total_consumption = 0
+    # Thread-safe counters: devices may be created and toggled from many threads.
+    # The counters are private; connected_devices and total_consumption read them as ints.
+    _connected_devices = ShardedCounter()
+    _total_consumption = ShardedCounter()
+    connected_devices = CounterValue("_connected_devices")
+    total_consumption = CounterValue("_total_consumption")
+    device_ids = itertools.count(1)  # next() hands out unique IDs atomically
 
     # Constructor (Initialization of object attributes)
-    def __init__(self, name, device_type, location, wattage=0):
+    # Devices attached to a DeviceHub report power changes to the hub instead
+    # of updating (and printing) the class totals themselves. Devices added to
+    # a DeviceRegistry tell it about every power change to keep it indexed.
+    def __init__(self, name, device_type, location, wattage=0, hub=None, registry=None):
         self.name = name
         self.device_type = device_type
         self.location = location
         self.wattage = wattage
         self.__power_status = False  # Initially, the device is OFF (private)
-        self.id = SmartDevice.register_device()  # Register the device upon creation
+        self.hub = hub
+        if hub is None:
+            self.id = SmartDevice.register_device()  # Register the device upon creation
+        else:
+            self.id = hub.attach(self)
+        self.registry = registry
+        if registry is not None:
+            registry.add(self)
 
     # Turn the device ON (Instance method(Inherits attributes))
     def turn_on(self):
         if not self.__power_status:
             self.__power_status = True
-            SmartDevice.update_consumption(self.wattage)
-            print(f"{self.name} turned ON")
+            if self.hub is None:
+                SmartDevice.update_consumption(self.wattage)
+                print(f"{self.name} turned ON")
+            else:
+                self.hub.record(self, self.wattage, True)
+            if self.registry is not None:
+                self.registry.power_changed(self)
 
     # Turn the device ON (Instance method)
     # def turn_on(self):
@@ -30,25 +124,33 @@ class SmartDevice:
     def turn_off(self):
         if self.__power_status:
             self.__power_status = False
-            SmartDevice.update_consumption(-self.wattage)
-            print(f"{self.name} turned OFF")
+            if self.hub is None:
+                SmartDevice.update_consumption(-self.wattage)
+                print(f"{self.name} turned OFF")
+            else:
+                self.hub.record(self, -self.wattage, False)
+            if self.registry is not None:
+                self.registry.power_changed(self)
 # Getter for private attribute __power_status
     def get_power_status(self):
         return self.__power_status
 
     # Class method to register a new device
     @classmethod
-    def register_device(cls):
-        cls.connected_devices += 1
-        print(f"Device registered. Total devices: {cls.connected_devices}")
-        return cls.connected_devices
+    def register_device(cls, verbose=True):
+        cls._connected_devices += 1
+        device_id = next(cls.device_ids)
+        if verbose:
+            print(f"Device registered. Total devices: {cls.connected_devices}")
+        return device_id
 
     # Class method to update the total power consumption
     # Triggered within the class
     @classmethod 
-    def update_consumption(cls, wattage_change):
-        cls.total_consumption += wattage_change
-        print(f"Updated total power consumption: {cls.total_consumption}W")
+    def update_consumption(cls, wattage_change, verbose=True):
+        cls._total_consumption += wattage_change
+        if verbose:
+            print(f"Updated total power consumption: {cls.total_consumption}W")
         return cls.connected_devices
 
     # Static method to convert Celsius to Fahrenheit
@@ -56,32 +158,591 @@ class SmartDevice:
     def convert_celcius_fahrenheit(celsius):
         return (celsius * 9 / 5) + 32
 
+    # Static method to convert Fahrenheit to Celsius
+    @staticmethod
+    def convert_fahrenheit_celcius(fahrenheit):
+        return (fahrenheit - 32) * 5 / 9
+
+    # Static methods to convert a whole buffer of thermostat readings in place
+    @staticmethod
+    def convert_celcius_fahrenheit_batch(readings):
+        return convert_readings(readings, celcius_to_fahrenheit_values, CELCIUS_TO_FAHRENHEIT)
+
+    @staticmethod
+    def convert_fahrenheit_celcius_batch(readings):
+        return convert_readings(readings, fahrenheit_to_celcius_values, FAHRENHEIT_TO_CELCIUS)
+
+
+class DeviceRegistry:
+    # Keeps track of devices with indexes by location, device type and power
+    # status. Each index maps a value to an ordered set (dict) of device ID ->
+    # device, so group operations only visit the devices that match.
+
+    # Constructor (Initialization of object attributes)
+    def __init__(self):
+        self.devices = {}  # Device ID -> device
+        self.by_location = {}
+        self.by_type = {}
+        self.by_status = {True: {}, False: {}}
+
+    def __len__(self):
+        return len(self.devices)
+
+    # Add a device to the registry and every index
+    def add(self, device):
+        self.devices[device.id] = device
+        self.by_location.setdefault(device.location, {})[device.id] = device
+        self.by_type.setdefault(device.device_type, {})[device.id] = device
+        self.by_status[device.get_power_status()][device.id] = device
+        device.registry = self
+
+    # Remove a device from the registry and every index
+    def remove(self, device):
+        self.devices.pop(device.id, None)
+        self.by_location.get(device.location, {}).pop(device.id, None)
+        self.by_type.get(device.device_type, {}).pop(device.id, None)
+        self.by_status[device.get_power_status()].pop(device.id, None)
+        device.registry = None
+
+    # Move a device to a new location, keeping the location index up to date
+    def relocate(self, device, location):
+        self.by_location.get(device.location, {}).pop(device.id, None)
+        device.location = location
+        self.by_location.setdefault(location, {})[device.id] = device
+
+    # Called by a device after it is turned on or off
+    def power_changed(self, device):
+        status = device.get_power_status()
+        self.by_status[not status].pop(device.id, None)
+        self.by_status[status][device.id] = device
+
+    # Find devices matching every given criterion, e.g. find(location="Bedroom")
+    # Starts from the smallest matching index and checks the others against it.
+    def find(self, location=None, device_type=None, power_status=None):
+        groups = []
+        if location is not None:
+            groups.append(self.by_location.get(location, {}))
+        if device_type is not None:
+            groups.append(self.by_type.get(device_type, {}))
+        if power_status is not None:
+            groups.append(self.by_status[power_status])
+        if not groups:
+            return list(self.devices.values())
+        groups.sort(key=len)
+        smallest, others = groups[0], groups[1:]
+        return [device for device_id, device in smallest.items()
+                if all(device_id in group for group in others)]
+
+    # Turn on every matching device that is currently off
+    def turn_on_where(self, location=None, device_type=None):
+        devices = self.find(location, device_type, power_status=False)
+        for device in devices:
+            device.turn_on()
+        return len(devices)
+
+    # Turn off every matching device that is currently on
+    def turn_off_where(self, location=None, device_type=None):
+        devices = self.find(location, device_type, power_status=True)
+        for device in devices:
+            device.turn_off()
+        return len(devices)
+
+
+class PowerSeries:
+    # Fixed-size ring buffer of power readings stored in flat arrays of floats.
+    # Each reading is the power (watts) from its timestamp until the next one.
+    # Alongside every reading the energy used since the first reading is kept,
+    # so the energy over any window is a difference of two running totals
+    # found by binary search, however many readings the window covers.
+
+    # Constructor (Initialization of object attributes)
+    def __init__(self, capacity=65536):
+        self.capacity = capacity
+        self.timestamps = array("d", [0.0]) * capacity
+        self.watts = array("d", [0.0]) * capacity
+        self.joules = array("d", [0.0]) * capacity  # Energy used before each reading
+        self.start = 0  # Position of the oldest reading
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    # Readings are indexed from the oldest (0) to the newest (len - 1)
+    def position(self, index):
+        return (self.start + index) % self.capacity
+
+    # Add a reading; once full, the oldest reading is overwritten
+    def append(self, timestamp, watts):
+        if self.size:
+            last = self.position(self.size - 1)
+            if timestamp < self.timestamps[last]:
+                raise ValueError("Readings must be added in time order.")
+            joules = self.joules[last] + self.watts[last] * (timestamp - self.timestamps[last])
+        else:
+            joules = 0.0
+        if self.size == self.capacity:
+            self.start = (self.start + 1) % self.capacity
+        else:
+            self.size += 1
+        position = self.position(self.size - 1)
+        self.timestamps[position] = timestamp
+        self.watts[position] = watts
+        self.joules[position] = joules
+
+    # Timestamp of a reading, so bisect can search the ring in time order
+    def __getitem__(self, index):
+        return self.timestamps[self.position(index)]
+
+    # Running energy total (in joules) at a timestamp. Times before the oldest
+    # kept reading are clamped to it: the readings before it have been
+    # overwritten, so a window reaching back that far only counts kept history
+    def energy_until(self, timestamp):
+        index = bisect.bisect_right(self, timestamp) - 1
+        if index < 0:
+            return self.joules[self.start] if self.size else 0.0
+        position = self.position(index)
+        return self.joules[position] + self.watts[position] * (timestamp - self.timestamps[position])
+
+    # Energy used between two timestamps, in kilowatt-hours
+    def energy_kwh(self, start, end):
+        return (self.energy_until(end) - self.energy_until(start)) / 3_600_000
+
+    # Average power over fixed-size time buckets, as (bucket start, watts) pairs
+    def downsample(self, bucket_seconds, start, end):
+        buckets = []
+        bucket_start = start
+        previous = self.energy_until(bucket_start)
+        while bucket_start < end:
+            bucket_end = min(bucket_start + bucket_seconds, end)
+            current = self.energy_until(bucket_end)
+            buckets.append((bucket_start, (current - previous) / (bucket_end - bucket_start)))
+            bucket_start, previous = bucket_end, current
+        return buckets
+
+
+class EnergyTelemetry:
+    # Power history for every device plus the aggregate of all devices.
+
+    # Constructor (Initialization of object attributes)
+    def __init__(self, capacity=65536, device_capacity=4096, clock=time.time):
+        self.device_capacity = device_capacity
+        self.clock = clock
+        self.aggregate = PowerSeries(capacity)
+        self.devices = {}  # Device ID -> PowerSeries
+
+    # Record a device's power; the timestamp defaults to now
+    def record(self, device_id, watts, timestamp=None):
+        series = self.devices.get(device_id)
+        if series is None:
+            series = self.devices[device_id] = PowerSeries(self.device_capacity)
+        series.append(self.clock() if timestamp is None else timestamp, watts)
+
+    # Record the aggregate power of all devices
+    def record_total(self, watts, timestamp=None):
+        self.aggregate.append(self.clock() if timestamp is None else timestamp, watts)
+
+    # Energy in kWh for one device, or for all devices if no ID is given
+    def energy_kwh(self, start, end, device_id=None):
+        series = self.aggregate if device_id is None else self.devices.get(device_id)
+        return series.energy_kwh(start, end) if series is not None else 0.0
+
+    # Average power over time buckets for one device or all devices
+    def downsample(self, bucket_seconds, start, end, device_id=None):
+        series = self.aggregate if device_id is None else self.devices.get(device_id)
+        return series.downsample(bucket_seconds, start, end) if series is not None else []
+
+
+class DeviceHub:
+    # Collects power changes from many devices and applies them in batches.
+    # Toggling a device only appends an event to a list; the totals are
+    # updated once per batch, and nothing is printed unless verbose is set.
+
+    # Constructor (Initialization of object attributes)
+    # Power transitions are recorded in telemetry (an EnergyTelemetry) if given.
+    def __init__(self, batch_size=1024, verbose=False, telemetry=None):
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.telemetry = telemetry
+        self.devices = {}  # Device ID -> device
+        self.pending = []  # (device, wattage change, power on, timestamp) events not yet applied
+        self.total_consumption = 0
+        self.location_consumption = {}  # Location -> watts in use
+        # Instrumentation counters
+        self.events_processed = 0
+        self.batches_processed = 0
+
+    # Register a device with the hub and return its ID
+    def attach(self, device):
+        device_id = SmartDevice.register_device(verbose=self.verbose)
+        self.devices[device_id] = device
+        return device_id
+
+    # Queue a power change; the batch is applied once it is full
+    # power_on is the device's new power status (a 0W device changes nothing)
+    # The time of the change is taken now, so telemetry keeps it even though
+    # the change is only applied when the batch is flushed
+    def record(self, device, wattage_change, power_on):
+        timestamp = self.telemetry.clock() if self.telemetry is not None else None
+        self.pending.append((device, wattage_change, power_on, timestamp))
+        if self.verbose:
+            print(f"{device.name} turned {'ON' if power_on else 'OFF'}")
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+
+    # Apply every queued power change in one pass
+    def flush(self):
+        if not self.pending:
+            return
+        events, self.pending = self.pending, []
+        batch_change = 0
+        location_consumption = self.location_consumption
+        for device, wattage_change, _, _ in events:
+            batch_change += wattage_change
+            location_consumption[device.location] = (
+                location_consumption.get(device.location, 0) + wattage_change)
+        if self.telemetry is not None:
+            # One reading per change, in order, stamped with the time it happened
+            total = self.total_consumption
+            for device, wattage_change, power_on, timestamp in events:
+                total += wattage_change
+                self.telemetry.record(device.id, device.wattage if power_on else 0, timestamp)
+                self.telemetry.record_total(total, timestamp)
+        self.total_consumption += batch_change
+        SmartDevice.update_consumption(batch_change, verbose=self.verbose)
+        self.events_processed += len(events)
+        self.batches_processed += 1
+
+    # Current consumption for the whole hub or one location
+    def get_consumption(self, location=None):
+        self.flush()
+        if location is None:
+            return self.total_consumption
+        return self.location_consumption.get(location, 0)
+
+    # Instrumentation counters for monitoring the hub
+    def get_stats(self):
+        return {
+            "devices": len(self.devices),
+            "events_processed": self.events_processed,
+            "batches_processed": self.batches_processed,
+            "pending_events": len(self.pending),
+        }
+
+
+class DeviceServer:
+    # Local stand-in for the network endpoint that real devices would expose.
+    # Every command waits for a simulated round trip before toggling the device.
+    COMMANDS = ("turn_on", "turn_off")
+
+    # Constructor (Initialization of object attributes)
+    def __init__(self, devices, latency=0.002, jitter=0.001):
+        self.devices = {device.id: device for device in devices}
+        self.latency = latency
+        self.jitter = jitter
+        self.commands_handled = 0
+
+    # Handle one command and return the device's new power status
+    async def handle(self, device_id, command):
+        if command not in self.COMMANDS:
+            raise ValueError(f"Unknown command: {command}")
+        await asyncio.sleep(self.latency + random.random() * self.jitter)
+        device = self.devices[device_id]
+        getattr(device, command)()
+        self.commands_handled += 1
+        return device.get_power_status()
+
+
+class RateLimiter:
+    # Token bucket: allows `rate` commands per second, with bursts of up to
+    # `burst` commands (a tenth of a second's worth by default).
+
+    # Constructor (Initialization of object attributes)
+    def __init__(self, rate, burst=None):
+        self.rate = rate
+        self.capacity = burst or max(1, rate // 10)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    # Wait until a token is available, then take it
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class ControlPlane:
+    # Sends turn_on/turn_off commands to many devices concurrently.
+    # A semaphore caps the commands in flight, an optional RateLimiter caps the
+    # commands per second, and the latency of every command is recorded: the
+    # whole time including waits for the limiter and semaphore, and the service
+    # time spent on the device alone.
+
+    # Constructor (Initialization of object attributes)
+    def __init__(self, server, max_in_flight=500, rate_limit=None):
+        self.server = server
+        self.semaphore = asyncio.Semaphore(max_in_flight)
+        self.limiter = RateLimiter(rate_limit) if rate_limit else None
+        self.latencies = []  # Seconds per command, from send() to the reply
+        self.service_times = []  # Seconds per command spent on the device
+
+    # Send one command and wait for the device's reply
+    async def send(self, device, command):
+        start = time.perf_counter()  # Before the queues, so waiting counts as latency
+        if self.limiter is not None:
+            await self.limiter.acquire()
+        async with self.semaphore:
+            service_start = time.perf_counter()
+            status = await self.server.handle(device.id, command)
+            end = time.perf_counter()
+            self.latencies.append(end - start)
+            self.service_times.append(end - service_start)
+            return status
+
+    # Send the same command to many devices at once
+    async def send_many(self, devices, command):
+        return await asyncio.gather(*(self.send(device, command) for device in devices))
+
+    # Group devices by their location
+    @staticmethod
+    def group_by_location(devices):
+        groups = {}
+        for device in devices:
+            groups.setdefault(device.location, []).append(device)
+        return groups
+
+    # Send a command to every device in one location
+    async def command_location(self, devices, location, command):
+        return await self.send_many(self.group_by_location(devices).get(location, []), command)
+
+    # Command latency percentiles in milliseconds, e.g. {50: 2.1, 99: 4.8}
+    # Pass samples=control_plane.service_times for the service time instead
+    def latency_percentiles(self, percentiles=(50, 90, 99), samples=None):
+        samples = self.latencies if samples is None else samples
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+        return {p: round(ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] * 1000, 3)
+                for p in percentiles}
+
+
+# Turn a fleet of simulated devices on and off through the control plane
+async def run_control_plane(device_count, rate_limit=None):
+    hub = DeviceHub()
+    locations = ["Living Room", "Kitchen", "Bedroom", "Office", "Garage"]
+    devices = [SmartDevice(f"Device {i}", "Plug", locations[i % len(locations)], 50, hub=hub)
+               for i in range(device_count)]
+    control_plane = ControlPlane(DeviceServer(devices), rate_limit=rate_limit)
+
+    start = time.perf_counter()
+    await control_plane.send_many(devices, "turn_on")
+    await control_plane.command_location(devices, "Bedroom", "turn_off")
+    elapsed = time.perf_counter() - start
+
+    commands = len(control_plane.latencies)
+    print(f"{commands} commands to {device_count} devices in {elapsed:.3f}s "
+          f"({commands / elapsed:,.0f} commands/s)")
+    print(f"Latency percentiles (ms): {control_plane.latency_percentiles()}")
+    print(f"Service time percentiles (ms): "
+          f"{control_plane.latency_percentiles(samples=control_plane.service_times)}")
+    print(f"Bedroom consumption: {hub.get_consumption('Bedroom')}W, "
+          f"Kitchen consumption: {hub.get_consumption('Kitchen')}W")
+
+
+def main():
+    # Instantiate SmartDevice objects
+    living_room_light = SmartDevice("LivingRoom Light", "Light", "Living Room", 10)
+    kitchen_thermostat = SmartDevice("Kitchen Thermostat", "Thermostat", "Kitchen", 0)
+    bedroom_plug = SmartDevice("Bedroom Plug", "Plug", "Bedroom", 100)
+    bedroom_plug_1 = SmartDevice("Bedroom Plug 1", "Plug", "Bedroom", 100)
+
+    # Test the functionality
+    print("\n--- Device Information ---")
+    print(f"Connected Devices: {living_room_light.connected_devices}")  # Access shared attribute
+    print(f"{kitchen_thermostat.name}, ID: {kitchen_thermostat.id}")
+
+    print("\n--- Device Operations ---")
+    living_room_light.turn_on()  # Turn ON the LivingRoom Light
+    living_room_light.turn_off()  # Turn OFF the LivingRoom Light
+    living_room_light.turn_on()  # Try turning it ON again
+
+    # Check power status using getter
+    print("\n--- Checking Power Status ---")
+    print(f"{kitchen_thermostat.name} Power Status: {kitchen_thermostat.get_power_status()}")
+
+    # Test static method
+    print("\n--- Celsius to Fahrenheit Conversion ---")
+    celsius = 37
+    fahrenheit = SmartDevice.convert_celcius_fahrenheit(celsius)
+    print(f"{celsius}°C is equal to {fahrenheit}°F")
+
+    # Convert a batch of thermostat readings in place
+    readings = array("d", [18.5, 21.0, 37.0])
+    SmartDevice.convert_celcius_fahrenheit_batch(readings)
+    print(f"Batch readings in °F: {readings.tolist()}")
+    SmartDevice.convert_fahrenheit_celcius_batch(readings)
+    print(f"Batch readings back in °C: {readings.tolist()}")
+
+    # Devices attached to a hub toggle silently and are accounted in batches
+    print("\n--- Device Hub ---")
+    hub = DeviceHub()
+    hallway_light = SmartDevice("Hallway Light", "Light", "Hallway", 15, hub=hub)
+    office_plug = SmartDevice("Office Plug", "Plug", "Office", 60, hub=hub)
+    hallway_light.turn_on()
+    office_plug.turn_on()
+    print(f"Hub consumption: {hub.get_consumption()}W")
+    print(f"Office consumption: {hub.get_consumption('Office')}W")
+    print(f"Hub stats: {hub.get_stats()}")
+
+    # Energy history: a 100W plug on for 30 minutes of a one-hour window
+    print("\n--- Energy Telemetry ---")
+    telemetry = EnergyTelemetry()
+    telemetry.record(office_plug.id, 0, timestamp=0)
+    telemetry.record(office_plug.id, 100, timestamp=900)
+    telemetry.record(office_plug.id, 0, timestamp=2700)
+    print(f"Energy used: {telemetry.energy_kwh(0, 3600, office_plug.id)} kWh")
+    print(f"15-minute averages: {telemetry.downsample(900, 0, 3600, office_plug.id)}")
+
+    # Group operations through the registry only touch matching devices
+    print("\n--- Device Registry ---")
+    registry = DeviceRegistry()
+    for device in (living_room_light, kitchen_thermostat, bedroom_plug, bedroom_plug_1):
+        registry.add(device)
+    registry.turn_on_where(location="Bedroom")
+    print(f"Plugs that are ON: {[device.name for device in registry.find(device_type='Plug', power_status=True)]}")
+    turned_off = registry.turn_off_where(location="Bedroom")
+    print(f"Turned off {turned_off} Bedroom devices")
+
+    # Control many devices concurrently with asyncio
+    print("\n--- Asyncio Control Plane ---")
+    asyncio.run(run_control_plane(200))
+
+
+# Benchmark: toggles per second with and without a hub
+def benchmark_toggles(device_count=1000, toggles=200000):
+    # Devices that print on every toggle (output is captured, not shown)
+    with redirect_stdout(io.StringIO()):
+        devices = [SmartDevice(f"Device {i}", "Plug", f"Room {i % 20}", 50)
+                   for i in range(device_count)]
+        start = time.perf_counter()
+        for i in range(toggles):
+            device = devices[i % device_count]
+            if device.get_power_status():
+                device.turn_off()
+            else:
+                device.turn_on()
+        direct_rate = toggles / (time.perf_counter() - start)
+
+    # Devices attached to a silent hub
+    hub = DeviceHub()
+    devices = [SmartDevice(f"Device {i}", "Plug", f"Room {i % 20}", 50, hub=hub)
+               for i in range(device_count)]
+    start = time.perf_counter()
+    for i in range(toggles):
+        device = devices[i % device_count]
+        if device.get_power_status():
+            device.turn_off()
+        else:
+            device.turn_on()
+    hub.flush()
+    hub_rate = toggles / (time.perf_counter() - start)
+
+    print(f"Direct (printing): {direct_rate:,.0f} toggles/s")
+    print(f"DeviceHub (batched): {hub_rate:,.0f} toggles/s")
+    print(f"Hub stats: {hub.get_stats()}")
+
+
+# Benchmark: energy queries over a month of one-minute readings
+def benchmark_telemetry(readings=43200, queries=10000):
+    series = PowerSeries(capacity=readings)
+    start = time.perf_counter()
+    for minute in range(readings):
+        series.append(minute * 60.0, 100.0 if minute % 2 else 0.0)
+    append_rate = readings / (time.perf_counter() - start)
+
+    end_time = readings * 60.0
+    start = time.perf_counter()
+    for i in range(queries):
+        window_start = (i * 7919) % end_time
+        series.energy_kwh(window_start, min(window_start + 86400, end_time))
+    query_rate = queries / (time.perf_counter() - start)
+
+    print(f"PowerSeries appends: {append_rate:,.0f} readings/s")
+    print(f"PowerSeries 24h energy queries: {query_rate:,.0f} queries/s")
+
+
+# Benchmark: batch temperature conversion against a scalar loop
+# (best of five runs, as single runs of this size are noisy)
+def benchmark_conversion(count=1_000_000, repeats=5):
+    celsius = [i % 40 - 5.0 for i in range(count)]
+
+    def best_time(convert, make_buffer):
+        times = []
+        for _ in range(repeats):
+            buffer = make_buffer()
+            start = time.perf_counter()
+            convert(buffer)
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def scalar_loop(readings):
+        for i, reading in enumerate(readings):
+            readings[i] = SmartDevice.convert_celcius_fahrenheit(reading)
+
+    scalar_time = best_time(scalar_loop, lambda: array("d", celsius))
+    batch_time = best_time(SmartDevice.convert_celcius_fahrenheit_batch, lambda: array("d", celsius))
+
+    print(f"Scalar loop: {scalar_time * 1000:.1f} ms for {count:,} readings")
+    print(f"Batch array.array: {batch_time * 1000:.1f} ms ({scalar_time / batch_time:.1f}x faster)")
+    if numpy is not None:
+        numpy_time = best_time(SmartDevice.convert_celcius_fahrenheit_batch,
+                               lambda: numpy.array(celsius))
+        print(f"Batch NumPy: {numpy_time * 1000:.1f} ms ({scalar_time / numpy_time:.1f}x faster)")
+
+
+# Stress test: class-level counters updated from many threads at once
+def stress_test_counters(thread_count=16, increments=100_000):
+    class PlainCounter:
+        count = 0
 
-# Instantiate SmartDevice objects
-living_room_light = SmartDevice("LivingRoom Light", "Light", "Living Room", 10)
-kitchen_thermostat = SmartDevice("Kitchen Thermostat", "Thermostat", "Kitchen", 0)
-bedroom_plug = SmartDevice("Bedroom Plug", "Plug", "Bedroom", 100)
-bedroom_plug_1 = SmartDevice("Bedroom Plug 1", "Plug", "Bedroom", 100)
+    class ShardedCounterHolder:
+        count = ShardedCounter()
 
-# Test the functionality
-print("\n--- Device Information ---")
-print(f"Connected Devices: {living_room_light.connected_devices}")  # Access shared attribute
-print(f"{kitchen_thermostat.name}, ID: {kitchen_thermostat.id}")
+    def plain_worker():
+        for _ in range(increments):
+            PlainCounter.count += 1
 
-print("\n--- Device Operations ---")
-living_room_light.turn_on()  # Turn ON the LivingRoom Light
-living_room_light.turn_off()  # Turn OFF the LivingRoom Light
-living_room_light.turn_on()  # Try turning it ON again
+    def sharded_worker():
+        for _ in range(increments):
+            ShardedCounterHolder.count += 1
 
-# Check power status using getter
-print("\n--- Checking Power Status ---")
-print(f"{kitchen_thermostat.name} Power Status: {kitchen_thermostat.get_power_status()}")
+    expected = thread_count * increments
+    for label, worker, holder in (("Plain int", plain_worker, PlainCounter),
+                                  ("ShardedCounter", sharded_worker, ShardedCounterHolder)):
+        threads = [threading.Thread(target=worker) for _ in range(thread_count)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        print(f"{label}: {int(holder.count):,} of {expected:,} counted "
+              f"({expected / elapsed:,.0f} increments/s with {thread_count} threads)")
 
-# Test static method
-print("\n--- Celsius to Fahrenheit Conversion ---")
-celsius = 37
-fahrenheit = SmartDevice.convert_celcius_fahrenheit(celsius)
-print(f"{celsius}°C is equal to {fahrenheit}°F")
 
 if __name__ == "__main__":
-    main()
+    if "--benchmark" in sys.argv:
+        stress_test_counters()
+        benchmark_conversion()
+        benchmark_toggles()
+        benchmark_telemetry()
+        asyncio.run(run_control_plane(5000))
+        asyncio.run(run_control_plane(5000, rate_limit=20000))
+    else:
+        main()
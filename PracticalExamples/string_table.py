@@ -0,0 +1,66 @@
+"""
+Dictionary encoding for the practical examples.
+
+A fleet of cars or vehicles has only a few hundred distinct makes, models and
+types, but every object would otherwise hold its own copy of each string.
+StringTable stores each distinct string once and gives it a small integer code,
+and EncodedField is a descriptor that keeps a string attribute as that code:
+
+    car_strings = StringTable()
+
+    class Car:
+        __slots__ = ("_make_code",)
+        make = EncodedField(car_strings)  # car.make reads and writes a string
+"""
+
+import threading
+
+
+class StringTable:
+    """Dictionary encoding: each distinct string is stored once and given a small integer code."""
+
+    def __init__(self):
+        self.codes = {}   # string -> code
+        self.values = []  # code -> string
+        self.folded = {}  # case-folded string -> set of codes, for case-insensitive matching
+        self.lock = threading.Lock()  # Only taken when a new string is added
+
+    def encode(self, value):
+        """Return the code for a string, adding it to the table if it is new."""
+        code = self.codes.get(value)
+        if code is None:
+            with self.lock:
+                # Check again: another thread may have added it while we waited
+                code = self.codes.get(value)
+                if code is None:
+                    code = len(self.values)
+                    self.values.append(value)
+                    self.folded.setdefault(value.casefold(), set()).add(code)
+                    self.codes[value] = code  # Last, so lock-free readers never see a missing value
+        return code
+
+    def decode(self, code):
+        """Return the string for a code."""
+        return self.values[code]
+
+    def codes_matching(self, value):
+        """Return the codes of every stored string equal to value, ignoring case."""
+        return self.folded.get(value.casefold(), set())
+
+
+class EncodedField:
+    """A string attribute stored as a code in a shared StringTable, in the slot _<name>_code."""
+
+    def __init__(self, table):
+        self.table = table
+
+    def __set_name__(self, owner, name):
+        self.slot = f"_{name}_code"
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        return self.table.values[getattr(instance, self.slot)]
+
+    def __set__(self, instance, value):
+        setattr(instance, self.slot, self.table.encode(value))
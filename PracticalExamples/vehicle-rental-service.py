@@ -1,7 +1,19 @@
 import json
 
+from instrumentation import instrumented
+from string_table import EncodedField, StringTable
+
+# One table shared by every vehicle: a fleet has few distinct types, makes and models
+vehicle_strings = StringTable()
+
 # Base class Vehicle
 class Vehicle:
+    # __slots__ removes the per-vehicle __dict__; type, make and model are integer codes
+    __slots__ = ("_type_code", "_make_code", "_model_code", "daily_rate")
+    type = EncodedField(vehicle_strings)
+    make = EncodedField(vehicle_strings)
+    model = EncodedField(vehicle_strings)
+
     def __init__(self, type, make, model, daily_rate):
         self.type = type
         self.make = make
@@ -11,6 +23,16 @@ class Vehicle:
     def __repr__(self):
         return f"Vehicle(type={self.type}, make={self.make}, model={self.model}, daily_rate={self.daily_rate})"
 
+    @staticmethod
+    def from_dict(data):
+        """Rebuild a vehicle from to_dict() output, as the subclass named by its type."""
+        data = dict(data)
+        vehicle_class = vehicle_classes.get(data["type"])
+        if vehicle_class is None:
+            return Vehicle(**data)
+        del data["type"]  # Car and Bike set their own type
+        return vehicle_class(**data)
+
     def to_dict(self):
         """Convert vehicle object to a dictionary for JSON serialization."""
         return {
@@ -22,6 +44,8 @@ class Vehicle:
 
 # Derived class Car inherits from Vehicle
 class Car(Vehicle):
+    __slots__ = ("is_convertible",)
+
     def __init__(self, make, model, daily_rate, is_convertible=False):
         super().__init__("Car", make, model, daily_rate)
         self.is_convertible = is_convertible
@@ -37,6 +61,8 @@ class Car(Vehicle):
 
 # Derived class Bike inherits from Vehicle
 class Bike(Vehicle):
+    __slots__ = ("has_sidecar",)
+
     def __init__(self, make, model, daily_rate, has_sidecar=False):
         super().__init__("Bike", make, model, daily_rate)
         self.has_sidecar = has_sidecar
@@ -50,11 +76,15 @@ class Bike(Vehicle):
         data["has_sidecar"] = self.has_sidecar
         return data
 
+# Used by Vehicle.from_dict to find the class for a saved vehicle's type
+vehicle_classes = {"Car": Car, "Bike": Bike}
+
 # VehicleRentalService that uses Vehicle or its subclasses
 class VehicleRentalService:
     def __init__(self):
         self.vehicles = []
 
+    @instrumented("rental_service_add_vehicle")
     def add_vehicle(self, vehicle):
         """Add a new vehicle to the fleet."""
         if not isinstance(vehicle, Vehicle):
@@ -62,6 +92,7 @@ class VehicleRentalService:
         self.vehicles.append(vehicle)
         print(f"Vehicle added: {vehicle}")
 
+    @instrumented("rental_service_update_vehicle")
     def update_vehicle(self, index, make=None, model=None, daily_rate=None, additional_attributes=None):
         """Update an existing vehicle's details."""
         if index < 0 or index >= len(self.vehicles):
@@ -82,6 +113,7 @@ class VehicleRentalService:
                 vehicle.has_sidecar = additional_attributes['has_sidecar']
         print(f"Vehicle updated: {vehicle}")
 
+    @instrumented("rental_service_list_vehicles")
     def list_vehicles(self):
         """List all vehicles in the fleet."""
         if not self.vehicles:
@@ -89,6 +121,7 @@ class VehicleRentalService:
         for i, vehicle in enumerate(self.vehicles):
             print(f"{i + 1}. {vehicle}")
 
+    @instrumented("rental_service_calculate_rental_cost")
     def calculate_rental_cost(self, index, days):
         """Calculate the rental cost for a specific vehicle."""
         if index < 0 or index >= len(self.vehicles):
@@ -98,6 +131,7 @@ class VehicleRentalService:
         vehicle = self.vehicles[index]
         return vehicle.daily_rate * days
 
+    @instrumented("rental_service_export_vehicles")
     def export_vehicles(self, filename):
         """Export vehicle data to a JSON file."""
         vehicle_data = [vehicle.to_dict() for vehicle in self.vehicles]
@@ -105,11 +139,12 @@ class VehicleRentalService:
             json.dump(vehicle_data, file, indent=4)
         print(f"Vehicle data exported to {filename}.")
 
+    @instrumented("rental_service_import_vehicles")
     def import_vehicles(self, filename):
         """Import vehicle data from a JSON file."""
         with open(filename, "r") as file:
             vehicle_data = json.load(file)
-        self.vehicles = [Vehicle(**data) for data in vehicle_data]
+        self.vehicles = [Vehicle.from_dict(data) for data in vehicle_data]
         print(f"Vehicle data imported from {filename}.")
 
 def main():
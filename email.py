@@ -1,5 +1,15 @@
+import gc
+import os
+import sys
+import time
+
 from tabulate import tabulate
 
+# The instrumentation and object_pool modules are shared with the practical examples.
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "PracticalExamples"))
+from instrumentation import instrumented  # noqa: E402
+from object_pool import GCMonitor, ObjectPool  # noqa: E402
+
 # --- Email Class --- #
 class Email:
     """A class to represent an email."""
@@ -12,6 +22,10 @@ class Email:
         - email_content: Content/body of the email.
         - has_been_read: Boolean to track if the email has been read (default: False).
         """
+        self.reset(email_address, subject_line, email_content)
+
+    def reset(self, email_address, subject_line, email_content):
+        """Gives the email new details and marks it unread; used to reuse a pooled email."""
         self.email_address = email_address
         self.subject_line = subject_line
         self.email_content = email_content
@@ -27,6 +41,20 @@ class Email:
 
 
 # --- Functions --- #
+def new_email(email_address, subject_line, email_content):
+    """Creates an email, reusing a deleted one from email_pool when pooling is on."""
+    if email_pool is None:
+        return Email(email_address, subject_line, email_content)
+    return email_pool.acquire(email_address, subject_line, email_content)
+
+
+def discard_email(email):
+    """Hands a deleted email back to email_pool when pooling is on."""
+    if email_pool is not None:
+        email_pool.release(email)
+
+
+@instrumented("email_populate_inbox")
 def populate_inbox():
     """Populates the inbox with sample emails."""
     sample_emails = [
@@ -35,9 +63,10 @@ def populate_inbox():
         ("noreply@cogrammar.com", "Your excellent marks!", "You scored excellently on your last project!"),
     ]
     for email_address, subject_line, email_content in sample_emails:
-        inbox.append(Email(email_address, subject_line, email_content))
+        inbox.append(new_email(email_address, subject_line, email_content))
 
 
+@instrumented("email_list_emails")
 def list_emails():
     """Lists all emails with their index, subject line, and read status."""
     if not inbox:
@@ -52,6 +81,7 @@ def list_emails():
     print(tabulate(table, headers=["Index", "Subject Line", "Status"], tablefmt="grid"))
 
 
+@instrumented("email_read_email")
 def read_email():
     """Allows the user to read a selected email."""
     if not inbox:
@@ -74,6 +104,7 @@ def read_email():
         print(f"\nError: {e}")
 
 
+@instrumented("email_view_unread_emails")
 def view_unread_emails():
     """Displays unread emails with their index and subject line."""
     unread_emails = [email for email in inbox if not email.has_been_read]
@@ -89,6 +120,7 @@ def view_unread_emails():
         print("\nNo unread emails.")
 
 
+@instrumented("email_delete_email")
 def delete_email():
     """Allows the user to delete a selected email."""
     if not inbox:
@@ -101,12 +133,14 @@ def delete_email():
         if 0 <= index < len(inbox):
             deleted_email = inbox.pop(index)
             print(f"\nDeleted email: {deleted_email.subject_line}")
+            discard_email(deleted_email)
         else:
             raise ValueError("Invalid index. Please enter a valid email index.")
     except ValueError as e:
         print(f"\nError: {e}")
 
 
+@instrumented("email_email_statistics")
 def email_statistics():
     """Displays statistics about the inbox."""
     total_emails = len(inbox)
@@ -121,14 +155,42 @@ def email_statistics():
 
 # --- Lists --- #
 inbox = []  # Stores the email objects.
+email_pool = None  # Optional: set to ObjectPool(Email, Email.reset) to reuse deleted emails.
 
-# --- Email Program --- #
-populate_inbox()  # Populate inbox with sample emails.
 
-# Display menu options.
-while True:
-    print(
-        """
+def benchmark_email_pool(count=100_000, cycles=10):
+    """Fills and empties the inbox repeatedly, with and without email_pool."""
+    global email_pool
+    saved_pool = email_pool
+    rows = [(f"sender{i}@example.com", f"Subject {i}", "Content") for i in range(count)]
+    try:
+        for label, pool in (("new emails", None), ("pooled emails", ObjectPool(Email, Email.reset))):
+            email_pool = pool
+            gc.collect()
+            with GCMonitor() as monitor:
+                start = time.perf_counter()
+                for _ in range(cycles):
+                    inbox.extend(new_email(*row) for row in rows)
+                    for email in inbox:
+                        discard_email(email)
+                    inbox.clear()
+                elapsed = time.perf_counter() - start
+            allocated = pool.created if pool else count * cycles
+            print(f"{label}: {elapsed * 1000:.1f} ms, {allocated:,} emails allocated, "
+                  f"{len(monitor.pauses)} GC runs pausing {monitor.total_pause() * 1000:.1f} ms")
+    finally:
+        email_pool = saved_pool
+
+
+# --- Email Program --- #
+def main():
+    """Runs the email menu."""
+    populate_inbox()  # Populate inbox with sample emails.
+
+    # Display menu options.
+    while True:
+        print(
+            """
 Would you like to:
     1. Read an email
     2. View unread emails
@@ -136,24 +198,31 @@ Would you like to:
     4. View email statistics
     5. Quit application
 """
-    )
-
-    try:
-        user_choice = int(input("\nEnter your choice: "))
-
-        if user_choice == 1:
-            read_email()
-        elif user_choice == 2:
-            view_unread_emails()
-        elif user_choice == 3:
-            delete_email()
-        elif user_choice == 4:
-            email_statistics()
-        elif user_choice == 5:
-            print("\nExiting Program. Goodbye!\n")
-            break
-        else:
-            raise ValueError("Invalid choice. Please enter a number between 1 and 5.")
-
-    except ValueError as e:
-        print(f"\nError: {e}")
+        )
+
+        try:
+            user_choice = int(input("\nEnter your choice: "))
+
+            if user_choice == 1:
+                read_email()
+            elif user_choice == 2:
+                view_unread_emails()
+            elif user_choice == 3:
+                delete_email()
+            elif user_choice == 4:
+                email_statistics()
+            elif user_choice == 5:
+                print("\nExiting Program. Goodbye!\n")
+                break
+            else:
+                raise ValueError("Invalid choice. Please enter a number between 1 and 5.")
+
+        except ValueError as e:
+            print(f"\nError: {e}")
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_email_pool()
+    else:
+        main()